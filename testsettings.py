@@ -24,3 +24,6 @@ SECRET_KEY = "abcde12345"
 
 if django.VERSION >= (3, 2):
     DEFAULT_AUTO_FIELD = "django.db.models.AutoField"
+
+# Keep the pre-Django 5.0 default, without a deprecation warning on 4.x.
+USE_TZ = False
@@ -1,11 +1,16 @@
 from django.views.generic import RedirectView, View
 
 from vanilla.model_views import (
+    BulkCreateView,
+    BulkDeleteView,
+    BulkUpdateView,
     CreateView,
     DeleteView,
     DetailView,
     GenericModelView,
     ListView,
+    MultipleDetailView,
+    StreamingListView,
     UpdateView,
 )
 from vanilla.views import FormView, GenericView, TemplateView
@@ -19,8 +24,13 @@ __all__ = (
     "TemplateView",
     "FormView",
     "ListView",
+    "StreamingListView",
     "DetailView",
     "CreateView",
     "UpdateView",
     "DeleteView",
+    "BulkCreateView",
+    "BulkUpdateView",
+    "BulkDeleteView",
+    "MultipleDetailView",
 )
@@ -0,0 +1,294 @@
+"""
+Async counterparts of the vanilla views, for use under ASGI.
+
+Database access uses Django's async ORM interface, so these views require
+Django 4.1 or later.
+"""
+from asgiref.sync import sync_to_async
+from django.core.exceptions import ImproperlyConfigured
+from django.core.paginator import InvalidPage, Paginator
+from django.db.models.query import QuerySet
+from django.http import Http404, HttpResponseRedirect
+from django.utils.translation import gettext as _
+
+from vanilla.model_views import (
+    CreateView,
+    DeleteView,
+    DetailView,
+    GenericModelView,
+    ListView,
+    UpdateView,
+)
+from vanilla.views import FormView, TemplateView
+
+
+async def aget_object_or_404(queryset, **kwargs):
+    """
+    Async equivalent of `django.shortcuts.get_object_or_404`.
+    """
+    try:
+        return await queryset.aget(**kwargs)
+    except queryset.model.DoesNotExist:
+        msg = "No %s matches the given query."
+        raise Http404(msg % queryset.model._meta.object_name)
+
+
+class AsyncTemplateView(TemplateView):
+    required_config = ("template_names",)
+
+    async def get(self, request, *args, **kwargs):
+        context = self.get_context_data()
+        return self.render_to_response(context)
+
+
+class AsyncFormView(FormView):
+    required_config = ("form_class", "template_names")
+
+    async def get(self, request, *args, **kwargs):
+        form = self.get_form()
+        context = self.get_context_data(form=form)
+        return self.render_to_response(context)
+
+    async def post(self, request, *args, **kwargs):
+        form = self.get_form(data=request.POST, files=request.FILES)
+        if form.is_valid():
+            return await self.form_valid(form)
+        return await self.form_invalid(form)
+
+    async def form_valid(self, form):
+        return HttpResponseRedirect(self.get_success_url())
+
+    async def form_invalid(self, form):
+        context = self.get_context_data(form=form)
+        return self.render_to_response(context)
+
+
+class AsyncGenericModelView(GenericModelView):
+    """
+    Base class for all async model generic views.
+
+    `get_object()` and `paginate_queryset()` are coroutines, while
+    `get_queryset()` and `get_context_data()` remain synchronous, since they
+    don't perform any I/O.
+    """
+
+    # Options of the synchronous views that the async views don't support.
+    # Setting any of them raises `ImproperlyConfigured` in `as_view()`.
+    unsupported_options = (
+        "direct_update",
+        "version_field",
+        "direct_delete",
+        "row_fields",
+        "json_fields",
+        "last_modified_field",
+        "response_cache_timeout",
+        "object_cache_timeout",
+    )
+
+    @classmethod
+    def as_view(cls, **initkwargs):
+        view = super(AsyncGenericModelView, cls).as_view(**initkwargs)
+        config = cls(**initkwargs)
+        for name in cls.unsupported_options:
+            if getattr(config, name, None) not in (None, False):
+                msg = "'%s' sets '%s', which is not supported by the async views."
+                raise ImproperlyConfigured(msg % (cls.__name__, name))
+        return view
+
+    async def get_object(self):
+        """
+        Returns the object the view is displaying.
+        """
+        if self.memoize_lookups and "_memoized_object" in vars(self):
+            return self._memoized_object
+
+        queryset = self.get_queryset()
+        lookup = self.get_lookup()
+        obj = await aget_object_or_404(queryset, **lookup)
+        if self.memoize_lookups:
+            self._memoized_object = obj
+        return obj
+
+    async def paginate_queryset(self, queryset, page_size):
+        """
+        Paginates a queryset, and returns a page object with its object
+        list already fetched.
+        """
+        paginator = self.get_paginator(queryset, page_size)
+        primed = type(paginator) is Paginator and isinstance(queryset, QuerySet)
+        if primed:
+            # Prime the paginator's cached count, so that it doesn't need
+            # to query the database synchronously.
+            paginator.count = await queryset.acount()
+
+        page_kwarg = self.kwargs.get(self.page_kwarg)
+        page_query_param = self.request.GET.get(self.page_kwarg)
+        page_number = page_kwarg or page_query_param or 1
+        try:
+            page_number = int(page_number)
+        except ValueError:
+            if page_number == "last":
+                if primed:
+                    page_number = paginator.num_pages
+                else:
+                    num_pages = sync_to_async(lambda: paginator.num_pages)
+                    page_number = await num_pages()
+            else:
+                msg = "Page is not 'last', nor can it be converted to an int."
+                raise Http404(_(msg))
+
+        try:
+            if primed:
+                page = paginator.page(page_number)
+            else:
+                page = await sync_to_async(paginator.page)(page_number)
+        except InvalidPage as exc:
+            msg = "Invalid page (%s): %s"
+            raise Http404(_(msg) % (page_number, str(exc)))
+
+        if isinstance(page.object_list, QuerySet):
+            page.object_list = [obj async for obj in page.object_list]
+        return page
+
+
+# The concrete async model views
+
+
+class AsyncListView(AsyncGenericModelView, ListView):
+    required_config = ("queryset", "template_names")
+
+    async def get(self, request, *args, **kwargs):
+        queryset = self.get_queryset()
+        paginate_by = self.get_paginate_by()
+
+        if paginate_by is None:
+            # Unpaginated response
+            if isinstance(queryset, QuerySet):
+                queryset = [obj async for obj in queryset]
+            self.object_list = queryset
+            if not self.allow_empty and not self.object_list:
+                raise Http404
+            context = self.get_context_data(
+                page_obj=None,
+                is_paginated=False,
+                paginator=None,
+            )
+        elif self.cursor_field is not None:
+            # Cursor paginated response
+            page = await sync_to_async(self.paginate_queryset_by_cursor)(
+                queryset, paginate_by
+            )
+            self.object_list = page.object_list
+            if not self.allow_empty and not page.object_list:
+                raise Http404
+            context = self.get_context_data(
+                is_paginated=page.has_other_pages(),
+                next_cursor=page.next_cursor,
+                previous_cursor=page.previous_cursor,
+            )
+        else:
+            # Paginated response
+            page = await self.paginate_queryset(queryset, paginate_by)
+            self.object_list = page.object_list
+            if not self.allow_empty and not page.object_list:
+                raise Http404
+            context = self.get_context_data(
+                page_obj=page,
+                is_paginated=page.has_other_pages(),
+                paginator=page.paginator,
+            )
+
+        return self.render_to_response(context)
+
+
+class AsyncDetailView(AsyncGenericModelView, DetailView):
+    required_config = ("queryset", "template_names")
+
+    async def get(self, request, *args, **kwargs):
+        self.object = await self.get_object()
+        context = self.get_context_data()
+        return self.render_to_response(context)
+
+
+class AsyncCreateView(AsyncGenericModelView, CreateView):
+    required_config = ("form_class", "template_names")
+
+    async def get(self, request, *args, **kwargs):
+        form = self.get_form()
+        context = self.get_context_data(form=form)
+        return self.render_to_response(context)
+
+    async def post(self, request, *args, **kwargs):
+        form = self.get_form(data=request.POST, files=request.FILES)
+        # Model form validation may query the database, eg. for uniqueness
+        # checks or model choice fields.
+        if await sync_to_async(form.is_valid)():
+            return await self.form_valid(form)
+        return await self.form_invalid(form)
+
+    async def form_valid(self, form):
+        self.object = form.save(commit=False)
+        await self.object.asave()
+        if self.object._meta.many_to_many:
+            await sync_to_async(form.save_m2m)()
+        self.invalidate_lookups()
+        return HttpResponseRedirect(self.get_success_url())
+
+    async def form_invalid(self, form):
+        context = self.get_context_data(form=form)
+        return self.render_to_response(context)
+
+
+class AsyncUpdateView(AsyncGenericModelView, UpdateView):
+    required_config = ("queryset", "form_class", "template_names")
+
+    async def get(self, request, *args, **kwargs):
+        self.object = await self.get_object()
+        form = self.get_form(instance=self.object)
+        context = self.get_context_data(form=form)
+        return self.render_to_response(context)
+
+    async def post(self, request, *args, **kwargs):
+        self.object = await self.get_object()
+        form = self.get_form(
+            data=request.POST,
+            files=request.FILES,
+            instance=self.object,
+        )
+        # Model form validation may query the database, eg. for uniqueness
+        # checks or model choice fields.
+        if await sync_to_async(form.is_valid)():
+            return await self.form_valid(form)
+        return await self.form_invalid(form)
+
+    async def form_valid(self, form):
+        self.object = form.save(commit=False)
+        await self.object.asave()
+        if self.object._meta.many_to_many:
+            await sync_to_async(form.save_m2m)()
+        await sync_to_async(self.invalidate_cached)(self.object)
+        self.invalidate_lookups()
+        return HttpResponseRedirect(self.get_success_url())
+
+    async def form_invalid(self, form):
+        context = self.get_context_data(form=form)
+        return self.render_to_response(context)
+
+
+class AsyncDeleteView(AsyncGenericModelView, DeleteView):
+    required_config = ("queryset", "template_names")
+
+    async def get(self, request, *args, **kwargs):
+        self.object = await self.get_object()
+        context = self.get_context_data()
+        return self.render_to_response(context)
+
+    async def post(self, request, *args, **kwargs):
+        self.object = await self.get_object()
+        await self.object.adelete()
+        # `adelete()` clears the primary key, so purge by the lookup value in
+        # the URL instead.
+        await sync_to_async(self.purge_cached_objects)()
+        await sync_to_async(self.purge_cached_response)()
+        self.invalidate_lookups()
+        return HttpResponseRedirect(self.get_success_url())
@@ -0,0 +1,233 @@
+"""
+Benchmarks comparing the vanilla views against Django's generic views.
+
+Run from the repository root, using the sqlite test settings:
+
+    python -m vanilla.benchmarks --iterations 200 --output report.json
+
+For each view, and for both a small and a large dataset, the report includes
+the requests per second, mean time per request, peak memory allocated while
+handling a single request, and the number of queries issued.
+"""
+import argparse
+import json
+import os
+import platform
+import sys
+import time
+import tracemalloc
+
+DATASETS = {"small": 10, "large": 10000}
+
+TEMPLATES = [
+    {
+        "BACKEND": "django.template.backends.django.DjangoTemplates",
+        "OPTIONS": {
+            "loaders": [
+                (
+                    "django.template.loaders.locmem.Loader",
+                    {
+                        "vanilla/example_list.html": (
+                            "{% for obj in object_list %}{{ obj.text }}{% endfor %}"
+                        ),
+                        "vanilla/example_detail.html": "{{ object.text }}",
+                        "vanilla/example_form.html": "{{ form }}",
+                        "vanilla/example_confirm_delete.html": "{{ object.text }}",
+                        "example.html": "{{ form }}",
+                    },
+                )
+            ]
+        },
+    }
+]
+
+
+def get_cases():
+    """
+    Returns a list of `(name, vanilla_view, django_view, method)` tuples.
+    """
+    from django.views import generic
+
+    import vanilla
+    from vanilla.tests import Example, ExampleForm
+
+    model_options = {"model": Example, "fields": ("text",), "success_url": "/"}
+    form_options = {
+        "form_class": ExampleForm,
+        "template_name": "example.html",
+        "success_url": "/",
+    }
+    return [
+        (
+            "ListView",
+            vanilla.ListView.as_view(model=Example, paginate_by=25),
+            generic.ListView.as_view(model=Example, paginate_by=25),
+            "get",
+        ),
+        (
+            "DetailView",
+            vanilla.DetailView.as_view(model=Example),
+            generic.DetailView.as_view(model=Example),
+            "get",
+        ),
+        (
+            "CreateView",
+            vanilla.CreateView.as_view(**model_options),
+            generic.CreateView.as_view(**model_options),
+            "post",
+        ),
+        (
+            "UpdateView",
+            vanilla.UpdateView.as_view(**model_options),
+            generic.UpdateView.as_view(**model_options),
+            "post",
+        ),
+        (
+            "DeleteView",
+            vanilla.DeleteView.as_view(model=Example, success_url="/"),
+            generic.DeleteView.as_view(model=Example, success_url="/"),
+            "post",
+        ),
+        (
+            "FormView",
+            vanilla.FormView.as_view(**form_options),
+            generic.FormView.as_view(**form_options),
+            "post",
+        ),
+        (
+            "TemplateView",
+            vanilla.TemplateView.as_view(template_name="example.html"),
+            generic.TemplateView.as_view(template_name="example.html"),
+            "get",
+        ),
+    ]
+
+
+def get_view_kwargs(name):
+    """
+    Returns the URL kwargs for a request, creating an instance to delete if
+    required. This is run outside of any timings.
+    """
+    from vanilla.tests import Example
+
+    if name in ("DetailView", "UpdateView"):
+        return {"pk": Example.objects.order_by("pk").values_list("pk")[0][0]}
+    elif name == "DeleteView":
+        return {"pk": Example.objects.create(text="delete").pk}
+    return {}
+
+
+def call_view(factory, view, method, kwargs):
+    """
+    Makes a single request to the view, and renders the response.
+    """
+    if method == "post":
+        request = factory.post("/", data={"text": "example"})
+    else:
+        request = factory.get("/")
+
+    response = view(request, **kwargs)
+    if hasattr(response, "render"):
+        response.render()
+    return response
+
+
+def measure(factory, name, view, method, iterations):
+    """
+    Returns a dictionary of measurements for a single view.
+    """
+    from django.db import connection
+    from django.test.utils import CaptureQueriesContext
+
+    # Warm up, and count the queries for a single request.
+    call_view(factory, view, method, get_view_kwargs(name))
+    kwargs = get_view_kwargs(name)
+    with CaptureQueriesContext(connection) as queries:
+        call_view(factory, view, method, kwargs)
+
+    kwargs = get_view_kwargs(name)
+    tracemalloc.start()
+    call_view(factory, view, method, kwargs)
+    peak_memory = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+
+    elapsed = 0.0
+    for _ in range(iterations):
+        kwargs = get_view_kwargs(name)
+        start = time.perf_counter()
+        call_view(factory, view, method, kwargs)
+        elapsed += time.perf_counter() - start
+
+    return {
+        "requests_per_second": iterations / elapsed,
+        "mean_ms": elapsed * 1000 / iterations,
+        "peak_memory_bytes": peak_memory,
+        "queries": len(queries),
+    }
+
+
+def run(iterations):
+    """
+    Runs every benchmark case against each dataset, and returns the report.
+    """
+    import django
+    from django.core.management import call_command
+    from django.test import RequestFactory
+    from django.test.utils import override_settings
+
+    from vanilla.tests import Example
+
+    call_command("migrate", run_syncdb=True, verbosity=0)
+    factory = RequestFactory()
+    results = []
+
+    with override_settings(TEMPLATES=TEMPLATES):
+        for dataset, size in DATASETS.items():
+            Example.objects.all().delete()
+            Example.objects.bulk_create([Example(text="example") for _ in range(size)])
+            for name, vanilla_view, django_view, method in get_cases():
+                for implementation, view in (
+                    ("vanilla", vanilla_view),
+                    ("django", django_view),
+                ):
+                    result = measure(factory, name, view, method, iterations)
+                    result.update(
+                        {
+                            "view": name,
+                            "implementation": implementation,
+                            "dataset": dataset,
+                            "rows": size,
+                        }
+                    )
+                    results.append(result)
+
+    return {
+        "python": platform.python_version(),
+        "django": django.get_version(),
+        "iterations": iterations,
+        "results": results,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--iterations", type=int, default=100)
+    parser.add_argument("--output", help="Write the JSON report to this file.")
+    args = parser.parse_args(argv)
+
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", "testsettings")
+    import django
+
+    django.setup()
+
+    report = run(args.iterations)
+    content = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w") as fp:
+            fp.write(content + "\n")
+    else:
+        sys.stdout.write(content + "\n")
+
+
+if __name__ == "__main__":
+    main()
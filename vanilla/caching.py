@@ -0,0 +1,105 @@
+import hashlib
+import uuid
+
+from django.core.cache import caches
+from django.core.exceptions import EmptyResultSet
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.utils.encoding import force_bytes
+
+# The `(lookup_field, cache_alias)` pairs used by response caching views,
+# keyed on model.
+_response_cache_lookups = {}
+
+
+def make_key(prefix, *parts):
+    """
+    Returns a cache key for the given parts, hashed so that it is safe to use
+    with any cache backend.
+    """
+    digest = hashlib.md5(force_bytes("|".join(str(part) for part in parts)))
+    return "vanilla:%s:%s" % (prefix, digest.hexdigest())
+
+
+def get_generation_key(model, lookup_field, value):
+    """
+    Returns the key holding the current generation token for the cached
+    responses of a single object. Deleting it invalidates those responses.
+    """
+    return make_key("generation", model._meta.label_lower, lookup_field, value)
+
+
+def get_lookup_value(instance, lookup_field):
+    """
+    Returns the value of `lookup_field` for an instance, following '__'
+    separated relationships, or `None` if it cannot be determined.
+    """
+    value = instance
+    for attr in lookup_field.split("__"):
+        value = getattr(value, attr, None)
+        if value is None:
+            return None
+    return value
+
+
+def register_response_cache(model, lookup_field, cache_alias):
+    """
+    Ensures cached responses for `model` are invalidated whenever an instance
+    is saved or deleted.
+    """
+    lookups = _response_cache_lookups.setdefault(model, set())
+    if not lookups:
+        dispatch_uid = "vanilla-response-cache-%s" % model._meta.label_lower
+        post_save.connect(invalidate_responses, sender=model, dispatch_uid=dispatch_uid)
+        post_delete.connect(
+            invalidate_responses, sender=model, dispatch_uid=dispatch_uid
+        )
+    lookups.add((lookup_field, cache_alias))
+
+
+def invalidate_responses(sender, instance, using=None, **kwargs):
+    """
+    Signal receiver that invalidates the cached responses for an instance.
+
+    Also called by the views that write without sending model signals. The
+    responses are invalidated again once the transaction commits, in case
+    another request cached a page showing the old row in the meantime.
+    """
+    keys = []
+    for lookup_field, cache_alias in _response_cache_lookups.get(sender, ()):
+        value = get_lookup_value(instance, lookup_field)
+        if value is not None:
+            keys.append((cache_alias, get_generation_key(sender, lookup_field, value)))
+    if not keys:
+        return
+
+    def invalidate():
+        for cache_alias, key in keys:
+            caches[cache_alias].delete(key)
+
+    invalidate()
+    transaction.on_commit(invalidate, using=using)
+
+
+def get_generation(cache, key, timeout, create=False):
+    """
+    Returns the generation token stored at `key`. If there isn't one, then
+    either returns `None`, or if `create` is set, stores a new token.
+    """
+    token = cache.get(key)
+    if token is None and create:
+        cache.add(key, uuid.uuid4().hex, timeout)
+        token = cache.get(key)
+    return token
+
+
+def get_query_key(queryset):
+    """
+    Returns a string identifying the SQL that a queryset will run, or `None`
+    if the queryset can never match any rows. No query is run.
+    """
+    try:
+        sql, params = queryset.query.sql_with_params()
+    except EmptyResultSet:
+        return None
+    return "%s|%s|%r" % (queryset.db, sql, params)
@@ -0,0 +1,91 @@
+"""
+Per-class view configuration, resolved once by `as_view()` rather than on
+every request.
+"""
+from django.core.exceptions import ImproperlyConfigured
+
+# Methods which, if overridden, may change what configuration a view needs,
+# or set it per request.
+CONSUMER_METHODS = (
+    "setup",
+    "dispatch",
+    "get_object",
+    "get_form",
+    "render_to_response",
+)
+
+# Returned by `get_precomputed()` when a value must be resolved per request.
+NOT_PRECOMPUTED = object()
+
+
+class PrecomputedConfig(dict):
+    """
+    The resolved configuration values, together with the view attributes
+    that each value was resolved from.
+    """
+
+    def __init__(self):
+        super(PrecomputedConfig, self).__init__()
+        self.sources = {}
+
+
+def precompute(view, defaults):
+    """
+    Given a view instance, and a dictionary mapping configuration keys to
+    `(method_name, default_method, kwargs, attrs)` tuples, calls each default
+    method that the view has not overridden, recording the values of the
+    attributes named in `attrs` that the result depends on.
+
+    Returns a two-tuple of dictionaries, `(config, errors)`, holding either
+    the resolved value or the `ImproperlyConfigured` error for each key.
+    """
+    config = PrecomputedConfig()
+    errors = {}
+    for key, (name, default, kwargs, attrs) in defaults.items():
+        if getattr(type(view), name) is not default:
+            continue
+        try:
+            config[key] = default(view, **kwargs)
+        except ImproperlyConfigured as exc:
+            errors[key] = exc
+        else:
+            config.sources[key] = [(attr, getattr(view, attr)) for attr in attrs]
+    return config, errors
+
+
+def get_precomputed(view, key):
+    """
+    Returns the precomputed value for `key`, or `NOT_PRECOMPUTED` if there
+    isn't one, or if the view instance has since changed any attribute that
+    the value was resolved from, for example by narrowing `queryset` or
+    setting `template_name` during the request.
+    """
+    config = view.precomputed
+    if not config or key not in config:
+        return NOT_PRECOMPUTED
+    for attr, value in getattr(config, "sources", {}).get(key, ()):
+        if getattr(view, attr) is not value:
+            return NOT_PRECOMPUTED
+    return config[key]
+
+
+def check_required_config(view_class, errors):
+    """
+    Raises the error for the first key of `required_config` that could not
+    be resolved.
+
+    Requirements are declared by the vanilla view classes, so if a subclass
+    overrides the request handlers, `setup()` or `dispatch()`, which may set
+    the configuration per request, or the methods that consume the
+    configuration, then they are not checked.
+    """
+    declaring_class = next(
+        base for base in view_class.__mro__ if "required_config" in vars(base)
+    )
+    for name in list(view_class.http_method_names) + list(CONSUMER_METHODS):
+        if getattr(view_class, name, None) is not getattr(declaring_class, name, None):
+            return
+
+    for key in view_class.required_config:
+        if key in errors:
+            raise errors[key]
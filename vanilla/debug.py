@@ -0,0 +1,163 @@
+"""
+Detection of N+1 query patterns while rendering model view templates.
+
+This is intended for use in development and tests, by setting
+`detect_n_plus_one = True` on a model view.
+"""
+import logging
+import re
+from collections import OrderedDict, namedtuple
+from contextlib import ExitStack
+
+from django.apps import apps
+from django.db import connections
+from django.template.response import TemplateResponse
+
+logger = logging.getLogger("vanilla")
+
+
+class NPlusOneWarning(RuntimeWarning):
+    pass
+
+
+RepeatedQuery = namedtuple("RepeatedQuery", ["sql", "count", "model", "suggestion"])
+
+
+class QueryRecorder(object):
+    """
+    A context manager that records the SQL of every query executed on any
+    database connection, without the parameters.
+    """
+
+    def __init__(self):
+        self.queries = []
+
+    def __call__(self, execute, sql, params, many, context):
+        self.queries.append(sql)
+        return execute(sql, params, many, context)
+
+    def __enter__(self):
+        self.stack = ExitStack()
+        for connection in connections.all():
+            self.stack.enter_context(connection.execute_wrapper(self))
+        return self
+
+    def __exit__(self, *exc_info):
+        self.stack.close()
+
+
+def normalize_sql(sql):
+    """
+    Returns the SQL with variable length `IN (...)` lists and whitespace
+    normalized, so that per-row queries compare equal.
+    """
+    sql = re.sub(r"\((?:%s, )*%s\)", "(...)", sql)
+    return re.sub(r"\s+", " ", sql).strip()
+
+
+def get_model_for_sql(sql):
+    """
+    Returns the model for the first table in a `SELECT` query, or `None`.
+    """
+    match = re.search(r'\bFROM\s+[`"\[]?(\w+)', sql, re.IGNORECASE)
+    if match is None:
+        return None
+    for model in apps.get_models():
+        if model._meta.db_table == match.group(1):
+            return model
+    return None
+
+
+def find_relation_path(model, target, max_depth=3):
+    """
+    Returns a `(path, select_related)` two-tuple for the shortest relation
+    path from `model` to `target`, or `(None, False)` if there is none.
+
+    `select_related` indicates that every step is single-valued, so that the
+    path can be followed with `select_related()` rather than
+    `prefetch_related()`.
+    """
+    queue = [(model, [], True)]
+    seen = {model}
+    while queue:
+        current, path, single = queue.pop(0)
+        if len(path) >= max_depth:
+            continue
+        for field in current._meta.get_fields():
+            related_model = field.related_model if field.is_relation else None
+            if related_model is None or isinstance(related_model, str):
+                continue
+            if hasattr(field, "get_accessor_name"):
+                # Reverse relations are followed by their accessor name.
+                name = field.get_accessor_name()
+            else:
+                name = field.name
+            if name is None:
+                continue
+            step_single = single and (field.many_to_one or field.one_to_one)
+            if related_model is target:
+                return "__".join(path + [name]), step_single
+            if related_model not in seen:
+                seen.add(related_model)
+                queue.append((related_model, path + [name], step_single))
+    return None, False
+
+
+def find_repeated_queries(queries, model=None, threshold=3):
+    """
+    Groups the recorded queries by normalized SQL, and returns a list of
+    `RepeatedQuery` instances for any that were run `threshold` or more times.
+    """
+    counts = OrderedDict()
+    for sql in queries:
+        key = normalize_sql(sql)
+        counts[key] = counts.get(key, 0) + 1
+
+    repeated = []
+    for sql, count in counts.items():
+        if count < threshold:
+            continue
+        target = get_model_for_sql(sql)
+        suggestion = None
+        if model is not None and target is not None:
+            path, select_related = find_relation_path(model, target)
+            if path is not None:
+                method = "select_related" if select_related else "prefetch_related"
+                suggestion = "%s('%s')" % (method, path)
+        repeated.append(RepeatedQuery(sql, count, target, suggestion))
+    return repeated
+
+
+def format_repeated_query(repeated, view_name):
+    msg = "'%s' ran a query %d times while rendering: %s" % (
+        view_name,
+        repeated.count,
+        repeated.sql,
+    )
+    if repeated.suggestion is not None:
+        msg += " (consider using %s)" % repeated.suggestion
+    return msg
+
+
+class QueryRecordingTemplateResponse(TemplateResponse):
+    """
+    A `TemplateResponse` that records the queries run while rendering, and
+    passes them to the view's `report_n_plus_one()` method.
+    """
+
+    # Django 4.1 renamed `rendering_attrs` to `non_picklable_attrs`.
+    if hasattr(TemplateResponse, "rendering_attrs"):
+        rendering_attrs = TemplateResponse.rendering_attrs + ["view"]
+    else:
+        non_picklable_attrs = TemplateResponse.non_picklable_attrs | {"view"}
+
+    def __init__(self, view, *args, **kwargs):
+        super(QueryRecordingTemplateResponse, self).__init__(*args, **kwargs)
+        self.view = view
+
+    @property
+    def rendered_content(self):
+        with QueryRecorder() as recorder:
+            content = super(QueryRecordingTemplateResponse, self).rendered_content
+        self.view.report_n_plus_one(recorder.queries)
+        return content
@@ -0,0 +1,49 @@
+"""
+Lazy context values, which are only computed if the template uses them.
+"""
+import logging
+
+logger = logging.getLogger("vanilla")
+
+
+class LazyValue(object):
+    """
+    Wraps a function that returns a context value, calling it at most once.
+
+    The Django template language calls callable context values when they
+    are used, so `{{ stats.total }}` calls the function the first time it is
+    rendered, and reuses the result after that. In Python code, or Jinja2
+    templates, call the lazy value to get the result.
+    """
+
+    def __init__(self, func):
+        self.func = func
+        self.evaluated = False
+        self.value = None
+
+    def __call__(self):
+        if not self.evaluated:
+            self.value = self.func()
+            self.evaluated = True
+        return self.value
+
+    def __repr__(self):
+        if self.evaluated:
+            return "<LazyValue: %r>" % (self.value,)
+        return "<LazyValue: unevaluated>"
+
+
+def lazy(func):
+    """
+    Returns a lazy context value for the given function.
+    """
+    return LazyValue(func)
+
+
+def get_lazy_values(context):
+    """
+    Returns a dictionary of the lazy values in a context dictionary.
+    """
+    return {
+        name: value for name, value in context.items() if isinstance(value, LazyValue)
+    }
@@ -1,17 +1,210 @@
+import warnings
+from calendar import timegm
+from collections import OrderedDict
+
 import django
-from django.core.exceptions import ImproperlyConfigured
+from django import forms
+from django.apps import apps
+from django.core.cache import caches
+from django.core.exceptions import (
+    FieldDoesNotExist,
+    ImproperlyConfigured,
+    SuspiciousOperation,
+    ValidationError,
+)
 from django.core.paginator import InvalidPage, Paginator
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import connections, transaction
+from django.db.models import FileField, IntegerField, Max, Prefetch
+from django.db.models.deletion import Collector
+from django.db.models.query import QuerySet
+from django.db.models.signals import class_prepared
 from django.forms import models as model_forms
-from django.http import Http404, HttpResponseRedirect
+from django.http import (
+    Http404,
+    HttpResponse,
+    HttpResponseRedirect,
+    JsonResponse,
+    StreamingHttpResponse,
+)
 from django.shortcuts import get_object_or_404
+from django.template.loader import select_template
 from django.template.response import TemplateResponse
+from django.utils import cache as cache_utils
+from django.utils.http import http_date, parse_http_date_safe, quote_etag
 from django.views.generic import View
 
+from vanilla.caching import (
+    get_generation,
+    get_generation_key,
+    get_lookup_value,
+    get_query_key,
+    invalidate_responses,
+    make_key,
+    register_response_cache,
+)
+from vanilla.config import (
+    NOT_PRECOMPUTED,
+    check_required_config,
+    get_precomputed,
+    precompute,
+)
+from vanilla.debug import (
+    NPlusOneWarning,
+    QueryRecordingTemplateResponse,
+    find_repeated_queries,
+    format_repeated_query,
+    logger,
+)
+from vanilla.lazy import LazyValue, get_lazy_values
+from vanilla.negotiation import select_media_type
+from vanilla.object_cache import (
+    get_cached_object,
+    invalidate_lookup_values,
+    invalidate_objects,
+    register_object_cache,
+)
+from vanilla.pagination import CachedCountPaginator, CursorPaginator, NoCountPaginator
+from vanilla.partials import BlockTemplate
+from vanilla.rows import project_rows
+from vanilla.template_cache import template_cache
+from vanilla.timing import dispatch_with_timings, emit_timings
+
 # Avoid RemovedInDjango40Warning on Django 3.0+
 if django.VERSION >= (3, 0):
     from django.utils.translation import gettext as _
+    from django.utils.translation import gettext_lazy
 else:
     from django.utils.translation import ugettext as _
+    from django.utils.translation import ugettext_lazy as gettext_lazy
+
+# The view attributes that the default `get_queryset()` is built from.
+QUERYSET_ATTRS = (
+    "queryset",
+    "model",
+    "select_related",
+    "prefetch_related",
+    "only_fields",
+    "defer_fields",
+    "annotations",
+)
+
+# Generated model form and formset classes, keyed on a tuple starting with
+# the model.
+_form_class_cache = {}
+
+
+def modelform_factory(model, fields, form=model_forms.ModelForm):
+    """
+    Returns a model form class for the given model and fields, building it
+    only the first time that combination is requested.
+    """
+    if not isinstance(fields, str):
+        fields = tuple(fields)
+    key = (model, fields, form)
+    try:
+        return _form_class_cache[key]
+    except KeyError:
+        cls = model_forms.modelform_factory(model, form=form, fields=fields)
+        _form_class_cache[key] = cls
+        return cls
+
+
+def modelformset_factory(model, form, extra=0):
+    """
+    Returns a model formset class for the given model and form class, building
+    it only the first time that combination is requested.
+    """
+    key = (model, "formset", form, extra)
+    try:
+        return _form_class_cache[key]
+    except KeyError:
+        cls = model_forms.modelformset_factory(model, form=form, extra=extra)
+        _form_class_cache[key] = cls
+        return cls
+
+
+def clear_form_class_cache(sender=None, **kwargs):
+    """
+    Discards cached form classes, either for a single model or entirely.
+
+    Connected to `class_prepared`, so that if a model class is redefined,
+    eg. on reload, form classes built against the old class are dropped.
+    """
+    if sender is None:
+        _form_class_cache.clear()
+        return
+
+    label = sender._meta.label
+    for key in list(_form_class_cache):
+        if key[0]._meta.label == label:
+            _form_class_cache.pop(key, None)
+
+
+class_prepared.connect(clear_form_class_cache)
+
+
+def check_lookup_path(model, path, relations_only=False, allow_accessors=False):
+    """
+    Raises `FieldDoesNotExist` if a '__' separated lookup path is not valid
+    for the given model.
+
+    If `relations_only` is set, each step must be a forward or reverse
+    relationship. If `allow_accessors` is set, any attribute on the model
+    is also accepted, such as a reverse relation's `<model>_set` manager.
+    """
+    for idx, name in enumerate(path.split("__")):
+        is_last = idx == path.count("__")
+        try:
+            field = model._meta.pk if name == "pk" else model._meta.get_field(name)
+        except FieldDoesNotExist:
+            if allow_accessors and hasattr(model, name):
+                return
+            raise
+
+        if field.is_relation:
+            model = field.related_model
+            if isinstance(model, str):
+                # The related model is not yet resolved.
+                return
+        elif relations_only or not is_last:
+            msg = "'%s' is not a relationship on '%s'"
+            raise FieldDoesNotExist(msg % (name, model._meta.object_name))
+
+
+def get_lookup_target(model, path):
+    """
+    Returns the field at the end of a '__' separated lookup path.
+    """
+    for name in path.split("__"):
+        if name == "pk":
+            field = model._meta.pk
+        else:
+            field = model._meta.get_field(name)
+        if field.is_relation:
+            model = field.related_model
+    return field
+
+
+def has_many_to_many_fields(formset):
+    """
+    Returns `True` if a model formset's forms include any many-to-many
+    fields of the model.
+    """
+    fields = formset.form.base_fields
+    return any(field.name in fields for field in formset.model._meta.many_to_many)
+
+
+def can_return_bulk_pks(using):
+    """
+    Returns `True` if the database sets the primary keys of objects created
+    by `bulk_create()`.
+    """
+    features = connections[using].features
+    if hasattr(features, "can_return_rows_from_bulk_insert"):
+        return features.can_return_rows_from_bulk_insert
+    # Django < 3.0
+    return features.can_return_ids_from_bulk_insert
 
 
 class GenericModelView(View):
@@ -42,27 +235,263 @@ class GenericModelView(View):
     paginate_by = None
     page_kwarg = "page"
 
+    # Set `paginate_without_count` to avoid a `COUNT(*)` query per page, or
+    # set `count_cache_timeout` to a number of seconds to cache the count.
+    paginate_without_count = False
+    count_cache_timeout = None
+
+    # Cursor pagination parameters.
+    # Set `cursor_field` to a unique, ordered field to use keyset pagination
+    # in place of page numbers. Prefix with '-' for descending order.
+    cursor_field = None
+    cursor_kwarg = "cursor"
+
     # Suffix that should be appended to automatically generated template names.
     template_name_suffix = None
 
+    # Conditional GET parameters.
+    # Set `last_modified_field` to a datetime field on the model to enable
+    # `Last-Modified` headers and `304 Not Modified` responses.
+    last_modified_field = None
+
+    # Set `memoize_lookups` to `False` to query the database on every call
+    # to `get_object()` and `get_queryset()`, rather than once per request.
+    memoize_lookups = True
+
+    # Queryset optimization parameters.
+    # These are applied by `get_queryset()`, and are validated against the
+    # model when the view class is created.
+    select_related = None
+    prefetch_related = None
+    only_fields = None
+    defer_fields = None
+    annotations = None
+
+    # N+1 query detection parameters.
+    # Set `detect_n_plus_one` in development or tests to report any query
+    # that runs `n_plus_one_threshold` or more times while rendering.
+    detect_n_plus_one = False
+    n_plus_one_threshold = 3
+
+    # Per-phase timing parameters.
+    # Set `record_timings` to time each phase of handling a request.
+    record_timings = False
+    server_timing_header = True
+
+    # JSON responses.
+    # Set `json_fields` to respond to clients that prefer JSON to HTML with
+    # the `values()` of these fields, rather than rendering a template.
+    json_fields = None
+
+    # Lazy context values.
+    # A dictionary mapping context names to the names of view methods, which
+    # are only called if the template uses the value.
+    lazy_context = None
+
+    # Set `cache_templates` to resolve and compile the view's templates once,
+    # rather than on every request.
+    cache_templates = False
+
+    # Partial rendering parameters.
+    # Set `partials` to a list of block names, or a dictionary mapping names
+    # to template names, to allow rendering just part of the page.
+    partials = None
+    partial_param = "partial"
+    partial_header = "X-Partial"
+
+    # Rendered response caching parameters.
+    # Set `response_cache_timeout` to a number of seconds to cache rendered
+    # detail responses, keyed on the lookup value.
+    response_cache_timeout = None
+    response_cache_alias = "default"
+    # The key for the current request's response, set by `get()`.
+    response_cache_key = None
+
+    # Object caching parameters.
+    # Set `object_cache_timeout` to a number of seconds to cache the objects
+    # that `get_object()` looks up for GET and HEAD requests, keyed on the
+    # lookup value. `object_cache_local_timeout` is how long each process
+    # also keeps its own copy.
+    object_cache_timeout = None
+    object_cache_alias = "default"
+    object_cache_local_timeout = 5
+
+    def __init_subclass__(cls, **kwargs):
+        super(GenericModelView, cls).__init_subclass__(**kwargs)
+        # Report misconfigured queryset options at import time, if the
+        # model fields are available yet. Otherwise `as_view()` will do so.
+        if apps.models_ready:
+            cls.check_queryset_options()
+
+    # Configuration that does not vary between requests is resolved once by
+    # `as_view()`, and stored in `precomputed`. The keys of `required_config`
+    # must resolve, or `as_view()` raises `ImproperlyConfigured`.
+    precomputed = None
+    required_config = ()
+
+    @classmethod
+    def as_view(cls, **initkwargs):
+        view = super(GenericModelView, cls).as_view(**initkwargs)
+
+        cls.check_queryset_options(**initkwargs)
+        config = cls(**initkwargs)
+
+        precomputed, errors = precompute(
+            config,
+            {
+                "queryset": (
+                    "get_queryset",
+                    GenericModelView.get_queryset,
+                    {},
+                    QUERYSET_ATTRS,
+                ),
+                "form_class": (
+                    "get_form_class",
+                    GenericModelView.get_form_class,
+                    {},
+                    ("form_class", "model", "fields"),
+                ),
+                "template_names": (
+                    "get_template_names",
+                    GenericModelView.get_template_names,
+                    {},
+                    ("template_name", "model", "template_name_suffix"),
+                ),
+                "context_object_name": (
+                    "get_context_object_name",
+                    GenericModelView.get_context_object_name,
+                    {"is_list": False},
+                    ("context_object_name", "model"),
+                ),
+                "context_object_list_name": (
+                    "get_context_object_name",
+                    GenericModelView.get_context_object_name,
+                    {"is_list": True},
+                    ("context_object_name", "model"),
+                ),
+            },
+        )
+        check_required_config(cls, errors)
+        if config.queryset is None:
+            # The default manager is called per request, as it may be dynamic.
+            precomputed.pop("queryset", None)
+        # Passed to each view instance, along with the other initkwargs.
+        view.view_initkwargs["precomputed"] = precomputed
+
+        # Connect the invalidation signals for response caching views.
+        if config.response_cache_timeout is not None:
+            model = config.model
+            if model is None and config.queryset is not None:
+                model = config.queryset.model
+            if model is not None:
+                register_response_cache(
+                    model, config.lookup_field, config.response_cache_alias
+                )
+
+        # Likewise for object caching views.
+        if config.object_cache_timeout is not None:
+            model = config.model
+            if model is None and config.queryset is not None:
+                model = config.queryset.model
+            if model is not None:
+                register_object_cache(
+                    model, config.lookup_field, config.object_cache_alias
+                )
+
+        return view
+
+    # Request dispatching
+
+    def dispatch(self, request, *args, **kwargs):
+        if self.record_timings:
+            dispatch = super(GenericModelView, self).dispatch
+            return dispatch_with_timings(self, dispatch, request, *args, **kwargs)
+        return super(GenericModelView, self).dispatch(request, *args, **kwargs)
+
+    def report_timings(self, response, timings):
+        """
+        Given the response and a dictionary of phase timings in seconds, adds
+        a `Server-Timing` header, sends the `view_timed` signal, and logs
+        the timings.
+        """
+        emit_timings(self, response, timings, header=self.server_timing_header)
+
     # Queryset and object lookup
 
     def get_object(self):
         """
         Returns the object the view is displaying.
+
+        Unless `memoize_lookups` is unset, the object is only fetched once
+        per request. If `object_cache_timeout` is set, then GET and HEAD
+        requests read it through the object cache.
         """
+        if self.memoize_lookups and "_memoized_object" in vars(self):
+            return self._memoized_object
+
         queryset = self.get_queryset()
-        lookup_url_kwarg = self.lookup_url_kwarg or self.lookup_field
+        lookup = self.get_lookup()
+        if self.object_cache_timeout is not None and self.request.method in (
+            "GET",
+            "HEAD",
+        ):
+            obj = get_cached_object(
+                queryset,
+                lookup,
+                self.lookup_field,
+                self.object_cache_alias,
+                self.object_cache_timeout,
+                self.object_cache_local_timeout,
+            )
+        else:
+            obj = get_object_or_404(queryset, **lookup)
+        if self.memoize_lookups:
+            self._memoized_object = obj
+        return obj
 
+    def get_lookup(self):
+        """
+        Returns the keyword arguments that filter the queryset down to the
+        object the view is displaying.
+        """
+        lookup_url_kwarg = self.lookup_url_kwarg or self.lookup_field
         try:
-            lookup = {self.lookup_field: self.kwargs[lookup_url_kwarg]}
+            return {self.lookup_field: self.kwargs[lookup_url_kwarg]}
         except KeyError:
             msg = "Lookup field '%s' was not provided in view kwargs to '%s'"
             raise ImproperlyConfigured(
                 msg % (lookup_url_kwarg, self.__class__.__name__)
             )
 
-        return get_object_or_404(queryset, **lookup)
+    def get_lookup_instance(self):
+        """
+        Returns an unsaved instance with only the lookup field set, for
+        validating forms without first fetching the object.
+        """
+        queryset = self.get_queryset()
+        model = queryset.model
+        lookup = self.get_lookup()
+        instance = model()
+        field_names = {field.name for field in model._meta.concrete_fields}
+        for name, value in lookup.items():
+            if name == "pk":
+                instance.pk = model._meta.pk.to_python(value)
+            elif name in field_names:
+                field = model._meta.get_field(name)
+                setattr(instance, field.attname, field.to_python(value))
+
+        # The instance stands in for an existing row, so that unique
+        # validation excludes that row. For lookups other than the primary
+        # key, that requires fetching the primary key, but only if the model
+        # has any other unique fields.
+        instance._state.adding = False
+        if instance.pk is None:
+            unique_checks, date_checks = instance._get_unique_checks()
+            pk_check = (model._meta.pk.name,)
+            if date_checks or any(check != pk_check for _, check in unique_checks):
+                pks = queryset.filter(**lookup).values_list("pk", flat=True)
+                instance.pk = pks.first()
+        return instance
 
     def get_queryset(self):
         """
@@ -70,18 +499,104 @@ class GenericModelView(View):
 
         Either used as a list of objects to display, or as the queryset
         from which to perform the individual object lookup.
+
+        Unless `memoize_lookups` is unset, the same queryset is returned for
+        the rest of the request, so that its results are only fetched once.
+        """
+        if self.memoize_lookups and "_memoized_queryset" in vars(self):
+            return self._memoized_queryset
+
+        queryset = get_precomputed(self, "queryset")
+        if queryset is NOT_PRECOMPUTED:
+            queryset = self.build_queryset()
+        else:
+            queryset = queryset._clone()
+        if self.memoize_lookups:
+            self._memoized_queryset = queryset
+        return queryset
+
+    def build_queryset(self):
+        """
+        Returns a new base queryset, from the `queryset` or `model`
+        attributes, with any queryset optimization attributes applied.
         """
         if self.queryset is not None:
-            return self.queryset._clone()
+            queryset = self.queryset._clone()
+        elif self.model is not None:
+            queryset = self.model._default_manager.all()
+        else:
+            msg = (
+                "'%s' must either define 'queryset' or 'model', or override "
+                + "'get_queryset()'"
+            )
+            raise ImproperlyConfigured(msg % self.__class__.__name__)
 
-        if self.model is not None:
-            return self.model._default_manager.all()
+        if self.select_related:
+            queryset = queryset.select_related(*self.select_related)
+        if self.prefetch_related:
+            queryset = queryset.prefetch_related(*self.prefetch_related)
+        if self.annotations:
+            queryset = queryset.annotate(**self.annotations)
+        if self.only_fields:
+            queryset = queryset.only(*self.only_fields)
+        if self.defer_fields:
+            queryset = queryset.defer(*self.defer_fields)
+        return queryset
+
+    def invalidate_lookups(self):
+        """
+        Discards the memoized object and queryset, so that the next calls to
+        `get_object()` and `get_queryset()` query the database again.
+        """
+        vars(self).pop("_memoized_object", None)
+        vars(self).pop("_memoized_queryset", None)
 
-        msg = (
-            "'%s' must either define 'queryset' or 'model', or override "
-            + "'get_queryset()'"
-        )
-        raise ImproperlyConfigured(msg % self.__class__.__name__)
+    @classmethod
+    def check_queryset_options(cls, **initkwargs):
+        """
+        Raises `ImproperlyConfigured` if any of the queryset optimization
+        attributes do not match the model.
+
+        Reads the class attributes, overridden by any `initkwargs` passed to
+        `as_view()`, so that no view instance is needed.
+        """
+
+        def get(name):
+            return initkwargs.get(name, getattr(cls, name))
+
+        model = get("model")
+        queryset = get("queryset")
+        if model is None and queryset is not None:
+            model = queryset.model
+        if model is None:
+            return
+
+        options = [
+            ("select_related", get("select_related"), True, False),
+            ("prefetch_related", get("prefetch_related"), True, True),
+            ("only_fields", get("only_fields"), False, False),
+            ("defer_fields", get("defer_fields"), False, False),
+        ]
+        for attr, paths, relations_only, allow_accessors in options:
+            if isinstance(paths, str):
+                msg = "'%s.%s' must be a list or tuple, not a string."
+                raise ImproperlyConfigured(msg % (cls.__name__, attr))
+            for path in paths or ():
+                if isinstance(path, Prefetch):
+                    path = path.prefetch_through
+                try:
+                    check_lookup_path(model, path, relations_only, allow_accessors)
+                except FieldDoesNotExist as exc:
+                    msg = "Invalid '%s' on '%s': %s"
+                    raise ImproperlyConfigured(msg % (attr, cls.__name__, exc))
+
+        for name in get("annotations") or {}:
+            try:
+                model._meta.get_field(name)
+            except FieldDoesNotExist:
+                continue
+            msg = "Annotation '%s' on '%s' conflicts with a field on the model."
+            raise ImproperlyConfigured(msg % (name, cls.__name__))
 
     # Form instantiation
 
@@ -89,11 +604,15 @@ class GenericModelView(View):
         """
         Returns the form class to use in this view.
         """
+        form_class = get_precomputed(self, "form_class")
+        if form_class is not NOT_PRECOMPUTED:
+            return form_class
+
         if self.form_class is not None:
             return self.form_class
 
         if self.model is not None and self.fields is not None:
-            return model_forms.modelform_factory(self.model, fields=self.fields)
+            return modelform_factory(self.model, fields=self.fields)
 
         msg = (
             "'%s' must either define 'form_class' or both 'model' and "
@@ -108,6 +627,14 @@ class GenericModelView(View):
         cls = self.get_form_class()
         return cls(data=data, files=files, **kwargs)
 
+    @classmethod
+    def warm_form_class(cls, **initkwargs):
+        """
+        Builds the default form class ahead of time, eg. from `AppConfig.ready()`,
+        so that the first request doesn't pay for it.
+        """
+        return cls(**initkwargs).get_form_class()
+
     # Pagination
 
     def get_paginate_by(self):
@@ -120,8 +647,35 @@ class GenericModelView(View):
         """
         Returns a paginator instance.
         """
+        if self.paginate_without_count:
+            return NoCountPaginator(queryset, page_size)
+        if self.count_cache_timeout is not None:
+            return CachedCountPaginator(
+                queryset, page_size, timeout=self.count_cache_timeout
+            )
         return Paginator(queryset, page_size)
 
+    def get_cursor_paginator(self, queryset, page_size):
+        """
+        Returns a cursor paginator instance.
+        """
+        return CursorPaginator(queryset, page_size, ordering=self.cursor_field)
+
+    def paginate_queryset_by_cursor(self, queryset, page_size):
+        """
+        Paginates a queryset using keyset pagination, and returns a cursor
+        page object.
+        """
+        paginator = self.get_cursor_paginator(queryset, page_size)
+        cursor_kwarg = self.kwargs.get(self.cursor_kwarg)
+        cursor_query_param = self.request.GET.get(self.cursor_kwarg)
+        cursor = cursor_kwarg or cursor_query_param or None
+        try:
+            return paginator.page(cursor)
+        except InvalidPage as exc:
+            msg = "Invalid cursor (%s): %s"
+            raise Http404(_(msg) % (cursor, str(exc)))
+
     def paginate_queryset(self, queryset, page_size):
         """
         Paginates a queryset, and returns a page object.
@@ -152,6 +706,11 @@ class GenericModelView(View):
         Returns a descriptive name to use in the context in addition to the
         default 'object'/'object_list'.
         """
+        key = "context_object_list_name" if is_list else "context_object_name"
+        name = get_precomputed(self, key)
+        if name is not NOT_PRECOMPUTED:
+            return name
+
         if self.context_object_name is not None:
             return self.context_object_name
 
@@ -171,6 +730,7 @@ class GenericModelView(View):
         * 'view'
         * Optionally, 'object' or 'object_list'
         * Optionally, '{context_object_name}' or '{context_object_name}_list'
+        * Any `lazy_context` values
         """
         kwargs["view"] = self
 
@@ -186,6 +746,11 @@ class GenericModelView(View):
             if context_object_name:
                 kwargs[context_object_name] = self.object_list
 
+        if self.lazy_context:
+            for name, method_name in self.lazy_context.items():
+                if name not in kwargs:
+                    kwargs[name] = LazyValue(getattr(self, method_name))
+
         return kwargs
 
     def get_template_names(self):
@@ -195,6 +760,10 @@ class GenericModelView(View):
         If `.template_name` is not specified, then defaults to the following
         pattern: "{app_label}/{model_name}{template_name_suffix}.html"
         """
+        template_names = get_precomputed(self, "template_names")
+        if template_names is not NOT_PRECOMPUTED:
+            return list(template_names)
+
         if self.template_name is not None:
             return [self.template_name]
 
@@ -214,62 +783,606 @@ class GenericModelView(View):
         )
         raise ImproperlyConfigured(msg % self.__class__.__name__)
 
+    def get_template(self):
+        """
+        Returns the template to render. Either the list of template names,
+        or if `cache_templates` is set, the compiled template.
+        """
+        template_names = self.get_template_names()
+        if self.cache_templates:
+            return template_cache.get_template(type(self), template_names)
+        return template_names
+
     def render_to_response(self, context):
         """
         Given a context dictionary, returns an HTTP response.
         """
-        return TemplateResponse(
-            request=self.request, template=self.get_template_names(), context=context
+        partial = self.get_partial()
+        if partial is None:
+            template = self.get_template()
+        else:
+            template = self.get_partial_template(partial)
+        if self.detect_n_plus_one:
+            response = QueryRecordingTemplateResponse(
+                view=self, request=self.request, template=template, context=context
+            )
+        else:
+            response = TemplateResponse(
+                request=self.request, template=template, context=context
+            )
+        if self.partials and self.partial_header is not None:
+            cache_utils.patch_vary_headers(response, [self.partial_header])
+        if get_lazy_values(context):
+            response.add_post_render_callback(self.report_lazy_context)
+        return response
+
+    def report_lazy_context(self, response):
+        """
+        Post-render callback for responses with lazy context values. Sets
+        `unused_lazy_context` to the names of any lazy values the template
+        did not use, and logs them.
+        """
+        lazy_values = get_lazy_values(response.context_data)
+        self.unused_lazy_context = sorted(
+            name for name, value in lazy_values.items() if not value.evaluated
+        )
+        if self.unused_lazy_context:
+            logger.debug(
+                "'%s' did not use the lazy context values: %s",
+                self.__class__.__name__,
+                ", ".join(self.unused_lazy_context),
+            )
+
+    def get_partial(self):
+        """
+        Returns the name of the partial requested by the query parameter or
+        header, or `None` if the full page was requested.
+        """
+        if not self.partials:
+            return None
+        name = self.request.GET.get(self.partial_param)
+        if not name and self.partial_header is not None:
+            name = self.request.headers.get(self.partial_header)
+        if not name:
+            return None
+        if name not in self.partials:
+            raise Http404(_("Unknown partial '%s'.") % name)
+        return name
+
+    def get_partial_template(self, name):
+        """
+        Returns the template to render for the named partial. Either the
+        mapped template name, or the block of the same name in the page
+        template.
+        """
+        if isinstance(self.partials, dict) and self.partials[name] is not None:
+            return self.partials[name]
+        return BlockTemplate(self.get_template(), name)
+
+    def accepts_json(self):
+        """
+        Returns `True` if `json_fields` is set, and the request's `Accept`
+        header prefers JSON to HTML.
+        """
+        if self.json_fields is None:
+            return False
+        media_types = ("text/html", "application/json")
+        return select_media_type(self.request, media_types) == "application/json"
+
+    def render_json_response(self, data):
+        """
+        Given JSON serializable data, returns an HTTP response.
+        """
+        return JsonResponse(data, encoder=DjangoJSONEncoder)
+
+    # N+1 query detection
+
+    def report_n_plus_one(self, queries):
+        """
+        Given the SQL of the queries run while rendering the template, sets
+        `n_plus_one_queries`, and issues a warning and a log record for each
+        repeated query.
+        """
+        model = self.model
+        if model is None and self.queryset is not None:
+            model = self.queryset.model
+        self.n_plus_one_queries = find_repeated_queries(
+            queries, model=model, threshold=self.n_plus_one_threshold
+        )
+        for repeated in self.n_plus_one_queries:
+            msg = format_repeated_query(repeated, self.__class__.__name__)
+            warnings.warn(msg, NPlusOneWarning, stacklevel=2)
+            logger.warning(msg, extra={"repeated_query": repeated})
+
+    def assert_no_n_plus_one(self):
+        """
+        Raises `AssertionError` if any repeated queries were run while
+        rendering the template. For use in tests, after rendering the
+        response.
+        """
+        repeated = getattr(self, "n_plus_one_queries", None)
+        if repeated is None:
+            msg = "'%s' has not rendered a response with 'detect_n_plus_one' set."
+            raise AssertionError(msg % self.__class__.__name__)
+        if repeated:
+            name = self.__class__.__name__
+            msgs = [format_repeated_query(query, name) for query in repeated]
+            raise AssertionError("\n".join(msgs))
+
+    # Conditional responses
+
+    def get_etag(self):
+        """
+        Returns an ETag for the current object or object list, or `None`.
+        """
+        return None
+
+    def get_last_modified(self):
+        """
+        Returns the last modified datetime for the current object, or for
+        the queryset if there is no object, or `None`.
+        """
+        if self.last_modified_field is None:
+            return None
+
+        if getattr(self, "object", None) is not None:
+            return getattr(self.object, self.last_modified_field)
+
+        queryset = self.get_queryset()
+        result = queryset.aggregate(last_modified=Max(self.last_modified_field))
+        return result["last_modified"]
+
+    def get_validators(self):
+        """
+        Returns a two-tuple of the quoted ETag and the last modified
+        timestamp, either of which may be `None`.
+        """
+        etag = self.get_etag()
+        last_modified = self.get_last_modified()
+        if etag is not None:
+            etag = quote_etag(etag)
+        if last_modified is not None:
+            last_modified = timegm(last_modified.utctimetuple())
+        return etag, last_modified
+
+    def get_conditional_response(self, etag, last_modified):
+        """
+        Returns a `304 Not Modified` or `412 Precondition Failed` response if
+        the request's conditional headers match the validators, or `None`.
+        """
+        if etag is None and last_modified is None:
+            return None
+        return cache_utils.get_conditional_response(
+            self.request, etag=etag, last_modified=last_modified
+        )
+
+    def set_validator_headers(self, response, etag, last_modified):
+        """
+        Adds the `ETag` and `Last-Modified` headers to the response.
+        """
+        if etag is not None and not response.has_header("ETag"):
+            response["ETag"] = etag
+        if last_modified is not None and not response.has_header("Last-Modified"):
+            response["Last-Modified"] = http_date(last_modified)
+        return response
+
+    # Rendered response caching
+
+    def get_response_cache_vary_key(self):
+        """
+        Returns a string of anything other than the object and template that
+        the rendered response depends on, such as the active language.
+        """
+        return ""
+
+    def get_response_cache_key(self):
+        """
+        Returns the cache key for the rendered response, or `None` if the
+        response can't be cached.
+
+        The key includes the SQL of the object lookup, so that views whose
+        querysets differ, such as by the requesting user, never share pages.
+        It also includes the object's current generation token, which is
+        created if need be. This is called before the object is fetched, so
+        that if the object changes while the page is rendering, the page is
+        stored under a generation that has already been invalidated.
+        """
+        lookup_url_kwarg = self.lookup_url_kwarg or self.lookup_field
+        value = self.kwargs.get(lookup_url_kwarg)
+        if value is None:
+            return None
+        queryset = self.get_queryset()
+        query_key = get_query_key(queryset.filter(**self.get_lookup()))
+        if query_key is None:
+            return None
+
+        cache = caches[self.response_cache_alias]
+        generation_key = get_generation_key(queryset.model, self.lookup_field, value)
+        generation = get_generation(
+            cache, generation_key, self.response_cache_timeout, create=True
+        )
+        templates = ",".join(self.get_template_names())
+        partial = self.get_partial() or ""
+        vary_key = self.get_response_cache_vary_key()
+        return make_key("response", generation, query_key, templates, partial, vary_key)
+
+    def get_cached_response(self):
+        """
+        Returns a previously rendered response, or `None`.
+        """
+        key = self.response_cache_key
+        if key is None:
+            return None
+        cached = caches[self.response_cache_alias].get(key)
+        if cached is None:
+            return None
+
+        content, headers = cached
+        response = HttpResponse(content)
+        for header, value in headers:
+            response[header] = value
+
+        etag = response.get("ETag")
+        last_modified = response.get("Last-Modified")
+        if last_modified is not None:
+            last_modified = parse_http_date_safe(last_modified)
+        return cache_utils.get_conditional_response(
+            self.request, etag=etag, last_modified=last_modified, response=response
         )
 
+    def cache_response(self, response):
+        """
+        Stores a rendered response. Used as a post-render callback.
+
+        As with Django's cache middleware, responses that set cookies, or
+        that include a CSRF token, are specific to the user, and so are not
+        cached.
+        """
+        if response.status_code != 200:
+            return
+        # Django 4.0 renamed `CSRF_COOKIE_USED` to `CSRF_COOKIE_NEEDS_UPDATE`.
+        meta = self.request.META
+        if response.cookies or meta.get("CSRF_COOKIE_USED"):
+            return
+        if meta.get("CSRF_COOKIE_NEEDS_UPDATE"):
+            return
+        key = self.response_cache_key
+        if key is not None:
+            cached = (response.content, list(response.items()))
+            cache = caches[self.response_cache_alias]
+            cache.set(key, cached, self.response_cache_timeout)
+
+    def invalidate_cached(self, obj):
+        """
+        Invalidates every cached response and cached copy of an object, for
+        writes that don't send model signals.
+        """
+        queryset = self.get_queryset()
+        invalidate_responses(queryset.model, obj, using=queryset.db)
+        invalidate_objects(queryset.model, obj, using=queryset.db)
+
+    def purge_cached_objects(self):
+        """
+        Invalidates the cached objects for the lookup value in the URL, for
+        writes that might not send model signals.
+        """
+        lookup_url_kwarg = self.lookup_url_kwarg or self.lookup_field
+        value = self.kwargs.get(lookup_url_kwarg)
+        if value is not None:
+            queryset = self.get_queryset()
+            invalidate_lookup_values(
+                queryset.model, self.lookup_field, [value], using=queryset.db
+            )
+
+    def purge_cached_response(self):
+        """
+        Invalidates the cached responses for the lookup value in the URL.
+        """
+        lookup_url_kwarg = self.lookup_url_kwarg or self.lookup_field
+        value = self.kwargs.get(lookup_url_kwarg)
+        if value is not None:
+            queryset = self.get_queryset()
+            key = get_generation_key(queryset.model, self.lookup_field, value)
+            cache = caches[self.response_cache_alias]
+            cache.delete(key)
+            # In case another request cached the old page before the commit.
+            transaction.on_commit(lambda: cache.delete(key), using=queryset.db)
+
 
 # The concrete model views
 
 
 class ListView(GenericModelView):
     template_name_suffix = "_list"
+    required_config = ("queryset", "template_names")
     allow_empty = True
 
+    # Set `row_fields` to list lightweight rows with only these fields,
+    # rather than model instances.
+    row_fields = None
+
+    # When responding with JSON, set `json_streaming` to stream unpaginated
+    # lists, fetching `json_chunk_size` rows from the database at a time.
+    json_streaming = False
+    json_chunk_size = 2000
+
     def get(self, request, *args, **kwargs):
         queryset = self.get_queryset()
         paginate_by = self.get_paginate_by()
-
-        if not self.allow_empty and not queryset.exists():
-            raise Http404
-
-        if paginate_by is None:
+        as_json = self.accepts_json()
+        if as_json:
+            fields = self.get_json_fields()
+            queryset = queryset.prefetch_related(None).values(*fields)
+        elif self.row_fields is not None:
+            queryset = project_rows(queryset, self.get_row_fields())
+
+        # Check conditional headers before any rows are fetched.
+        etag, last_modified = self.get_validators()
+        response = self.get_conditional_response(etag, last_modified)
+        if response is not None:
+            return response
+
+        # Note that when `allow_empty` is unset we check the fetched rows,
+        # rather than issuing a separate `.exists()` query. Evaluating an
+        # unpaginated queryset populates its result cache for the template.
+
+        if paginate_by is None and as_json and self.json_streaming:
+            # Streamed JSON response
+            if not self.allow_empty and not queryset.exists():
+                raise Http404
+            response = self.stream_json_response(queryset)
+            cache_utils.patch_vary_headers(response, ["Accept"])
+            return self.set_validator_headers(response, etag, last_modified)
+        elif paginate_by is None:
             # Unpaginated response
             self.object_list = queryset
+            if not self.allow_empty and not queryset:
+                raise Http404
             context = self.get_context_data(
                 page_obj=None,
                 is_paginated=False,
                 paginator=None,
             )
+        elif self.cursor_field is not None:
+            # Cursor paginated response
+            page = self.paginate_queryset_by_cursor(queryset, paginate_by)
+            self.object_list = page.object_list
+            if not self.allow_empty and not page.object_list:
+                raise Http404
+            context = self.get_context_data(
+                is_paginated=page.has_other_pages(),
+                next_cursor=page.next_cursor,
+                previous_cursor=page.previous_cursor,
+            )
         else:
             # Paginated response
             page = self.paginate_queryset(queryset, paginate_by)
             self.object_list = page.object_list
+            if not self.allow_empty and not page.object_list:
+                raise Http404
             context = self.get_context_data(
                 page_obj=page,
                 is_paginated=page.has_other_pages(),
                 paginator=page.paginator,
             )
 
+        if as_json:
+            response = self.render_json_response(self.get_json_data(context))
+        else:
+            response = self.render_to_response(context)
+        if self.json_fields is not None:
+            cache_utils.patch_vary_headers(response, ["Accept"])
+        return self.set_validator_headers(response, etag, last_modified)
+
+    def get_json_fields(self):
+        """
+        Returns the fields to fetch with `values()` for a JSON response,
+        including the cursor field if cursor pagination is used.
+        """
+        return self.with_cursor_field(self.json_fields)
+
+    def get_row_fields(self):
+        """
+        Returns the fields to fetch for each row when `row_fields` is set,
+        including the cursor field if cursor pagination is used.
+        """
+        return self.with_cursor_field(self.row_fields)
+
+    def with_cursor_field(self, fields):
+        fields = list(fields)
+        if self.cursor_field is not None:
+            cursor_field = self.cursor_field.lstrip("-")
+            if cursor_field not in fields:
+                fields.append(cursor_field)
+        return fields
+
+    def get_json_data(self, context):
+        """
+        Given the template context, returns the data for a JSON response,
+        with the list of rows and any pagination metadata.
+        """
+        data = {"object_list": list(context["object_list"])}
+        page = context.get("page_obj")
+        if page is not None:
+            data["page"] = page.number
+            if not self.paginate_without_count:
+                data["count"] = page.paginator.count
+                data["num_pages"] = page.paginator.num_pages
+            data["next_page"] = page.next_page_number() if page.has_next() else None
+            data["previous_page"] = (
+                page.previous_page_number() if page.has_previous() else None
+            )
+        if "next_cursor" in context:
+            data["next_cursor"] = context["next_cursor"]
+            data["previous_cursor"] = context["previous_cursor"]
+        return data
+
+    def stream_json_response(self, queryset):
+        """
+        Returns a streaming JSON response for the rows of the queryset.
+        """
+        return StreamingHttpResponse(
+            self.stream_json(queryset), content_type="application/json"
+        )
+
+    def stream_json(self, queryset):
+        encoder = DjangoJSONEncoder()
+        yield '{"object_list": ['
+        rows = queryset.iterator(chunk_size=self.json_chunk_size)
+        for idx, row in enumerate(rows):
+            yield ("," if idx else "") + encoder.encode(row)
+        yield "]}"
+
+
+class StreamingListView(ListView):
+    """
+    An unpaginated list view that streams the response, rendering the
+    header, each row, and the footer as separate template fragments.
+    """
+
+    required_config = ("queryset", "template_names")
+
+    # Number of rows to fetch from the database cursor at a time.
+    chunk_size = 2000
+    content_type = None
+
+    def get(self, request, *args, **kwargs):
+        queryset = self.get_queryset()
+        if self.row_fields is not None:
+            queryset = project_rows(queryset, self.get_row_fields())
+
+        # No rows are fetched before streaming starts, so use a cheap
+        # `.exists()` query to decide if the response should be a 404.
+        if not self.allow_empty and not queryset.exists():
+            raise Http404
+
+        self.object_list = queryset
+        context = self.get_context_data()
         return self.render_to_response(context)
 
+    def get_fragment_template_names(self, fragment):
+        """
+        Returns a list of template names for the given fragment, which is
+        one of 'header', 'row' or 'footer'.
+
+        Defaults to the template names for the view, with a suffix of the
+        fragment name, eg. "{app_label}/{model_name}_list_row.html".
+        """
+        names = []
+        for name in self.get_template_names():
+            base, dot, ext = name.rpartition(".")
+            if not dot:
+                base, ext = name, "html"
+            names.append("%s_%s.%s" % (base, fragment, ext))
+        return names
+
+    def get_fragment_template(self, fragment):
+        """
+        Returns the compiled template for the given fragment.
+        """
+        template_names = self.get_fragment_template_names(fragment)
+        if self.cache_templates:
+            return template_cache.get_template(type(self), template_names)
+        return select_template(template_names)
+
+    def iter_objects(self):
+        """
+        Iterates over `object_list` without populating the queryset's
+        result cache.
+        """
+        if isinstance(self.object_list, QuerySet):
+            return self.object_list.iterator(chunk_size=self.chunk_size)
+        return iter(self.object_list)
+
+    def stream_content(self, context, header, row, footer):
+        """
+        Yields the rendered header, rows and footer. The row fragment is
+        rendered without the request, to avoid running context processors
+        once per row.
+        """
+        context_object_name = self.get_context_object_name()
+
+        yield header.render(context, self.request)
+        for obj in self.iter_objects():
+            row_context = dict(context, object=obj)
+            if context_object_name:
+                row_context[context_object_name] = obj
+            yield row.render(row_context)
+        yield footer.render(context, self.request)
+
+    def render_to_response(self, context):
+        """
+        Given a context dictionary, returns a streaming HTTP response.
+
+        Templates are loaded up front, so that a missing template is
+        reported before any content is streamed.
+        """
+        header = self.get_fragment_template("header")
+        row = self.get_fragment_template("row")
+        footer = self.get_fragment_template("footer")
+        return StreamingHttpResponse(
+            self.stream_content(context, header, row, footer),
+            content_type=self.content_type,
+        )
+
 
 class DetailView(GenericModelView):
     template_name_suffix = "_detail"
+    required_config = ("queryset", "template_names")
 
     def get(self, request, *args, **kwargs):
+        if self.accepts_json():
+            self.object = self.get_json_object()
+            response = self.render_json_response(self.get_json_data())
+            cache_utils.patch_vary_headers(response, ["Accept"])
+            return response
+
+        if self.response_cache_timeout is not None:
+            self.response_cache_key = self.get_response_cache_key()
+            response = self.get_cached_response()
+            if response is not None:
+                return response
+
         self.object = self.get_object()
+
+        etag, last_modified = self.get_validators()
+        response = self.get_conditional_response(etag, last_modified)
+        if response is not None:
+            return response
+
         context = self.get_context_data()
-        return self.render_to_response(context)
+        response = self.render_to_response(context)
+        if self.json_fields is not None:
+            cache_utils.patch_vary_headers(response, ["Accept"])
+        response = self.set_validator_headers(response, etag, last_modified)
+        if self.response_cache_timeout is not None:
+            response.add_post_render_callback(self.cache_response)
+        return response
+
+    def get_json_object(self):
+        """
+        Returns the `values()` of `json_fields` for the object, as a
+        dictionary.
+
+        If a subclass overrides `get_object()`, for example to check access
+        to the object, then the object is looked up through it first.
+        """
+        queryset = self.get_queryset().values(*self.json_fields)
+        if type(self).get_object is not GenericModelView.get_object:
+            return get_object_or_404(queryset, pk=self.get_object().pk)
+        return get_object_or_404(queryset, **self.get_lookup())
+
+    def get_json_data(self):
+        """
+        Returns the data for a JSON response.
+        """
+        return self.object
 
 
 class CreateView(GenericModelView):
     success_url = None
     template_name_suffix = "_form"
+    required_config = ("form_class", "template_names")
 
     def get(self, request, *args, **kwargs):
         form = self.get_form()
@@ -284,6 +1397,7 @@ class CreateView(GenericModelView):
 
     def form_valid(self, form):
         self.object = form.save()
+        self.invalidate_lookups()
         return HttpResponseRedirect(self.get_success_url())
 
     def form_invalid(self, form):
@@ -304,6 +1418,86 @@ class CreateView(GenericModelView):
 class UpdateView(GenericModelView):
     success_url = None
     template_name_suffix = "_form"
+    required_config = ("queryset", "form_class", "template_names")
+
+    # If set, then valid submissions are saved with a single `UPDATE` query,
+    # without first fetching the object.
+    direct_update = False
+
+    # Optimistic concurrency control. If `version_field` is set, then the
+    # object's version is included in the form, and submissions only update
+    # the object if its version has not changed since the form was rendered.
+    version_field = None
+    version_form_field = "_version"
+    version_conflict_message = gettext_lazy(
+        "This %(verbose_name)s was changed by someone else while you were "
+        "editing it. Please review your changes and submit them again."
+    )
+
+    @classmethod
+    def as_view(cls, **initkwargs):
+        view = super(UpdateView, cls).as_view(**initkwargs)
+        config = cls(**initkwargs)
+        config.check_version_field()
+        config.check_direct_update()
+        return view
+
+    def check_direct_update(self):
+        """
+        Raises `ImproperlyConfigured` if `direct_update` is set, but the form
+        includes many-to-many or file fields, which a single `UPDATE` query
+        can't save.
+        """
+        if not self.direct_update:
+            return
+        try:
+            form_class = self.get_form_class()
+        except ImproperlyConfigured:
+            return
+        model = getattr(getattr(form_class, "_meta", None), "model", None)
+        if model is None:
+            return
+
+        opts = model._meta
+        for name in form_class.base_fields:
+            try:
+                field = opts.get_field(name)
+            except FieldDoesNotExist:
+                continue
+            if field.many_to_many or isinstance(field, FileField):
+                msg = (
+                    "'%s' has direct_update set, so it can't save the "
+                    "many-to-many or file field '%s'."
+                )
+                raise ImproperlyConfigured(msg % (self.__class__.__name__, name))
+
+    def check_version_field(self):
+        """
+        Raises `ImproperlyConfigured` if `version_field` is set, but is not
+        an integer field or a field with `auto_now` set.
+        """
+        if self.version_field is None:
+            return
+        model = self.model
+        if model is None and self.queryset is not None:
+            model = self.queryset.model
+        if model is None:
+            return
+
+        try:
+            field = model._meta.get_field(self.version_field)
+        except FieldDoesNotExist:
+            field = None
+        if not isinstance(field, IntegerField) and not getattr(
+            field, "auto_now", False
+        ):
+            msg = (
+                "'%s' has version_field '%s', which must be an integer field "
+                "or have auto_now set."
+            )
+            raise ImproperlyConfigured(
+                msg % (self.__class__.__name__, self.version_field)
+            )
 
     def get(self, request, *args, **kwargs):
         self.object = self.get_object()
@@ -312,6 +1506,9 @@ class UpdateView(GenericModelView):
         return self.render_to_response(context)
 
     def post(self, request, *args, **kwargs):
+        if self.direct_update:
+            return self.post_direct(request, *args, **kwargs)
+
         self.object = self.get_object()
         form = self.get_form(
             data=request.POST,
@@ -322,10 +1519,126 @@ class UpdateView(GenericModelView):
             return self.form_valid(form)
         return self.form_invalid(form)
 
+    def post_direct(self, request, *args, **kwargs):
+        """
+        Validates the form against an instance with only the lookup field
+        set, so that the object is only fetched if the form is invalid.
+        """
+        form = self.get_form(
+            data=request.POST,
+            files=request.FILES,
+            instance=self.get_lookup_instance(),
+        )
+        if form.is_valid():
+            return self.form_valid(form)
+        self.object = self.get_object()
+        return self.form_invalid(form)
+
+    def get_form(self, data=None, files=None, **kwargs):
+        """
+        Returns a form instance, including a hidden version field if
+        `version_field` is set.
+        """
+        form = super(UpdateView, self).get_form(data=data, files=files, **kwargs)
+        if self.version_field is not None:
+            instance = kwargs.get("instance")
+            form.fields[self.version_form_field] = self.get_version_form_field(instance)
+        return form
+
+    def get_version_form_field(self, instance):
+        """
+        Returns the hidden form field holding the object's version.
+        """
+        field = instance._meta.get_field(self.version_field)
+        initial = None
+        if getattr(instance, field.attname, None) is not None:
+            initial = field.value_to_string(instance)
+        return forms.CharField(widget=forms.HiddenInput, initial=initial)
+
     def form_valid(self, form):
-        self.object = form.save()
+        if self.direct_update or self.version_field is not None:
+            self.object = self.update_object(form)
+            if self.object is None:
+                return self.version_conflict(form)
+            # As `form.save()` would, save any many-to-many data once the
+            # object itself has been updated.
+            form._save_m2m()
+            # Queryset updates don't send the signals that invalidate cached
+            # copies of the object.
+            self.invalidate_cached(self.object)
+        else:
+            self.object = form.save()
+        self.invalidate_lookups()
+        if self.response_cache_timeout is not None:
+            self.purge_cached_response()
         return HttpResponseRedirect(self.get_success_url())
 
+    def update_object(self, form):
+        """
+        Saves the form fields with a single `UPDATE` query, and returns the
+        form's instance.
+
+        If `version_field` is set, then the update is conditional on the
+        submitted version, and `None` is returned if the object has since
+        changed. Raises `Http404` if the object does not exist.
+        """
+        instance = form.instance
+        values = {}
+        for field in instance._meta.concrete_fields:
+            if isinstance(field, FileField) and field.name in form.cleaned_data:
+                # Commits any uploaded file to storage.
+                values[field.attname] = field.pre_save(instance, False)
+            elif field.name in form.cleaned_data and not field.primary_key:
+                values[field.attname] = getattr(instance, field.attname)
+            elif getattr(field, "auto_now", False):
+                values[field.attname] = field.pre_save(instance, False)
+
+        lookup = self.get_lookup()
+        if self.version_field is not None:
+            field = instance._meta.get_field(self.version_field)
+            try:
+                version = field.to_python(form.cleaned_data[self.version_form_field])
+            except ValidationError:
+                version = None
+            if version is None:
+                return None
+            lookup[self.version_field] = version
+            if not getattr(field, "auto_now", False):
+                values[field.attname] = version + 1
+
+        if self.get_queryset().filter(**lookup).update(**values):
+            for attname, value in values.items():
+                setattr(instance, attname, value)
+            return instance
+
+        queryset = self.get_queryset()
+        if self.version_field is not None:
+            if queryset.filter(**self.get_lookup()).exists():
+                return None
+        msg = "No %s matches the given query."
+        raise Http404(msg % queryset.model._meta.object_name)
+
+    def version_conflict(self, form):
+        """
+        Re-renders the form with an error, after a submission that was based
+        on an out of date version of the object.
+
+        The form's version is set to the current version, so that the user
+        can review the changes and then submit the form again.
+        """
+        self.invalidate_lookups()
+        self.object = self.get_object()
+        field = self.object._meta.get_field(self.version_field)
+        data = form.data.copy()
+        data[self.version_form_field] = field.value_to_string(self.object)
+        form.data = data
+        form.add_error(
+            None,
+            self.version_conflict_message
+            % {"verbose_name": self.object._meta.verbose_name},
+        )
+        return self.form_invalid(form)
+
     def form_invalid(self, form):
         context = self.get_context_data(form=form)
         return self.render_to_response(context)
@@ -344,6 +1657,11 @@ class UpdateView(GenericModelView):
 class DeleteView(GenericModelView):
     success_url = None
     template_name_suffix = "_confirm_delete"
+    required_config = ("queryset", "template_names")
+
+    # If set, then the object is deleted with a single `queryset.delete()`,
+    # without first fetching it.
+    direct_delete = False
 
     def get(self, request, *args, **kwargs):
         self.object = self.get_object()
@@ -351,12 +1669,340 @@ class DeleteView(GenericModelView):
         return self.render_to_response(context)
 
     def post(self, request, *args, **kwargs):
-        self.object = self.get_object()
-        self.object.delete()
+        if self.direct_delete:
+            self.object = None
+            self.delete_object()
+        else:
+            self.object = self.get_object()
+            self.object.delete()
+        self.purge_cached_objects()
+        self.invalidate_lookups()
+        if self.response_cache_timeout is not None:
+            self.purge_cached_response()
         return HttpResponseRedirect(self.get_success_url())
 
+    def delete_object(self):
+        """
+        Deletes the object matching the lookup, without fetching it first.
+        Raises `Http404` if no rows were deleted.
+        """
+        queryset = self.get_queryset().filter(**self.get_lookup())
+        if not queryset.delete()[0]:
+            msg = "No %s matches the given query."
+            raise Http404(msg % queryset.model._meta.object_name)
+
     def get_success_url(self):
         if self.success_url is None:
             msg = "No URL to redirect to. '%s' must define 'success_url'"
             raise ImproperlyConfigured(msg % self.__class__.__name__)
         return self.success_url
+
+
+# The bulk editing views
+
+
+class BulkCreateView(GenericModelView):
+    """
+    Creates many objects from a single submission, using a model formset
+    and `bulk_create()`.
+    """
+
+    success_url = None
+    template_name_suffix = "_bulk_form"
+    required_config = ("queryset", "form_class", "template_names")
+
+    # Number of empty forms to display, and the batch size for `bulk_create()`.
+    formset_extra = 1
+    batch_size = None
+
+    def get(self, request, *args, **kwargs):
+        formset = self.get_formset()
+        context = self.get_context_data(formset=formset)
+        return self.render_to_response(context)
+
+    def post(self, request, *args, **kwargs):
+        formset = self.get_formset(data=request.POST, files=request.FILES)
+        if formset.is_valid():
+            return self.formset_valid(formset)
+        return self.formset_invalid(formset)
+
+    def get_formset_class(self):
+        """
+        Returns the formset class to use in this view.
+        """
+        model = self.get_queryset().model
+        return modelformset_factory(
+            model, form=self.get_form_class(), extra=self.formset_extra
+        )
+
+    def get_formset(self, data=None, files=None, **kwargs):
+        """
+        Returns a formset instance, with no existing objects.
+        """
+        cls = self.get_formset_class()
+        queryset = self.get_queryset().none()
+        return cls(data=data, files=files, queryset=queryset, **kwargs)
+
+    def formset_valid(self, formset):
+        objects = formset.save(commit=False)
+        queryset = self.get_queryset()
+        with transaction.atomic(using=queryset.db):
+            if has_many_to_many_fields(formset) and not can_return_bulk_pks(
+                queryset.db
+            ):
+                # Many-to-many data can only be saved once the objects have
+                # primary keys, which this database can't return from
+                # `bulk_create()`.
+                for obj in objects:
+                    obj.save(using=queryset.db)
+                self.object_list = objects
+            else:
+                self.object_list = queryset.bulk_create(
+                    objects, batch_size=self.batch_size
+                )
+            formset.save_m2m()
+        self.invalidate_lookups()
+        return HttpResponseRedirect(self.get_success_url())
+
+    def formset_invalid(self, formset):
+        context = self.get_context_data(
+            formset=formset, row_errors=self.get_row_errors(formset)
+        )
+        return self.render_to_response(context)
+
+    def get_row_errors(self, formset):
+        """
+        Returns a list of `(index, errors)` two-tuples, for each row of the
+        formset that has errors.
+        """
+        return [
+            (index, form.errors)
+            for index, form in enumerate(formset.forms)
+            if form.errors
+        ]
+
+    def get_success_url(self):
+        if self.success_url is None:
+            msg = "No URL to redirect to. '%s' must define 'success_url'"
+            raise ImproperlyConfigured(msg % self.__class__.__name__)
+        return self.success_url
+
+
+class BulkUpdateView(BulkCreateView):
+    """
+    Updates many objects from a single submission, using a model formset
+    over the queryset and `bulk_update()`.
+    """
+
+    formset_extra = 0
+
+    def get_formset(self, data=None, files=None, **kwargs):
+        """
+        Returns a formset instance, over the objects in the queryset.
+        """
+        cls = self.get_formset_class()
+        queryset = self.get_queryset()
+        return cls(data=data, files=files, queryset=queryset, **kwargs)
+
+    def formset_valid(self, formset):
+        # Collects the changed forms, and their many-to-many data.
+        formset.save(commit=False)
+        objects = []
+        fields = set()
+        for form in formset.initial_forms:
+            if form.has_changed():
+                objects.append(form.instance)
+                fields.update(form.changed_data)
+
+        # Only concrete, non-primary key model fields can be bulk updated.
+        opts = formset.model._meta
+        update_fields = [
+            field.name
+            for field in opts.concrete_fields
+            if field.name in fields and not field.primary_key
+        ]
+
+        queryset = self.get_queryset()
+        with transaction.atomic(using=queryset.db):
+            if objects and update_fields:
+                queryset.bulk_update(objects, update_fields, batch_size=self.batch_size)
+                # `bulk_update()` doesn't send the signals that invalidate
+                # cached responses and copies of the objects.
+                for obj in objects:
+                    self.invalidate_cached(obj)
+            formset.save_m2m()
+        self.invalidate_lookups()
+        self.object_list = objects
+        return HttpResponseRedirect(self.get_success_url())
+
+
+class BulkDeleteView(GenericModelView):
+    """
+    Deletes many objects from a single submission, using a single
+    `queryset.delete()`.
+    """
+
+    success_url = None
+    template_name_suffix = "_confirm_bulk_delete"
+    required_config = ("queryset", "template_names")
+
+    # The request parameter holding the lookup values. Defaults to
+    # `lookup_field`.
+    lookup_values_param = None
+
+    # If set, and the deletion would not cascade or send any signals, then
+    # the rows are deleted directly, without running the deletion collector.
+    fast_delete = False
+
+    def get(self, request, *args, **kwargs):
+        self.object_list = self.get_delete_queryset(request.GET)
+        context = self.get_context_data()
+        return self.render_to_response(context)
+
+    def post(self, request, *args, **kwargs):
+        queryset = self.get_delete_queryset(request.POST)
+        deleted_count, deleted_counts = self.delete_queryset(queryset)
+        invalidate_lookup_values(
+            queryset.model,
+            self.lookup_field,
+            self.get_lookup_values(request.POST),
+            using=queryset.db,
+        )
+        self.invalidate_lookups()
+        return self.delete_success(deleted_count, deleted_counts)
+
+    def get_lookup_values(self, data):
+        """
+        Returns the list of lookup values for the objects to delete,
+        converted to the lookup field's type. Invalid values are ignored.
+        """
+        param = self.lookup_values_param or self.lookup_field
+        field = get_lookup_target(self.get_queryset().model, self.lookup_field)
+        values = []
+        for value in data.getlist(param):
+            try:
+                value = field.to_python(value)
+            except ValidationError:
+                continue
+            if value not in (None, ""):
+                values.append(value)
+        return values
+
+    def get_delete_queryset(self, data):
+        """
+        Returns the queryset of objects to delete, filtered by the lookup
+        values in the request data.
+
+        Override this to delete by some other filter instead.
+        """
+        queryset = self.get_queryset()
+        values = self.get_lookup_values(data)
+        if not values:
+            return queryset.none()
+        return queryset.filter(**{self.lookup_field + "__in": values})
+
+    def delete_queryset(self, queryset):
+        """
+        Deletes the objects in the queryset, and returns a two-tuple of the
+        total number of objects deleted and a dictionary of the number
+        deleted for each model. Models with no objects deleted are left out.
+        """
+        if self.fast_delete:
+            collector = Collector(using=queryset.db)
+            if collector.can_fast_delete(queryset):
+                count = queryset._raw_delete(queryset.db)
+                counts = {queryset.model._meta.label: count} if count else {}
+                return count, counts
+        count, counts = queryset.delete()
+        # Older versions of Django also include zero counts for related
+        # models.
+        return count, {label: n for label, n in counts.items() if n}
+
+    def delete_success(self, deleted_count, deleted_counts):
+        """
+        Returns the response after a successful deletion. Redirects to the
+        `success_url` if it is set, or otherwise renders the template with
+        the deletion counts.
+        """
+        if self.success_url is not None:
+            return HttpResponseRedirect(self.get_success_url())
+        context = self.get_context_data(
+            deleted_count=deleted_count, deleted_counts=deleted_counts
+        )
+        return self.render_to_response(context)
+
+    def get_success_url(self):
+        return self.success_url
+
+
+# The multiple object detail view
+
+
+class MultipleDetailView(GenericModelView):
+    """
+    A page representing several objects, looked up by a list of values in
+    a single query, and listed in the order they were requested.
+    """
+
+    template_name_suffix = "_multiple_detail"
+    required_config = ("queryset", "template_names")
+
+    # The lookup values are taken from the URL kwarg, separated by
+    # `lookup_separator`, or otherwise from the repeated query parameter.
+    lookup_separator = ","
+    lookup_values_param = None
+
+    # The maximum number of objects a request may look up, and whether
+    # any values that don't match an object are ignored rather than a 404.
+    max_objects = 20
+    allow_missing = False
+
+    def get(self, request, *args, **kwargs):
+        self.object_list, missing = self.get_objects()
+        if missing and not self.allow_missing:
+            msg = "No %s matches the given query."
+            raise Http404(msg % self.get_queryset().model._meta.object_name)
+        context = self.get_context_data(missing_values=missing)
+        return self.render_to_response(context)
+
+    def get_lookup_values(self):
+        """
+        Returns the list of requested lookup values, without duplicates.
+        """
+        lookup_url_kwarg = self.lookup_url_kwarg or self.lookup_field
+        if lookup_url_kwarg in self.kwargs:
+            values = self.kwargs[lookup_url_kwarg].split(self.lookup_separator)
+        else:
+            param = self.lookup_values_param or self.lookup_field
+            values = self.request.GET.getlist(param)
+        return list(OrderedDict.fromkeys(value for value in values if value))
+
+    def get_objects(self):
+        """
+        Returns a two-tuple of the list of objects, in the requested order,
+        and the list of lookup values that did not match an object.
+        """
+        values = self.get_lookup_values()
+        if len(values) > self.max_objects:
+            msg = "'%s' can look up at most %d objects."
+            raise SuspiciousOperation(msg % (self.__class__.__name__, self.max_objects))
+
+        queryset = self.get_queryset()
+        field = get_lookup_target(queryset.model, self.lookup_field)
+        keys = []
+        for value in values:
+            try:
+                keys.append(field.to_python(value))
+            except ValidationError:
+                keys.append(None)
+
+        found = {}
+        lookups = [key for key in keys if key is not None]
+        if lookups:
+            queryset = queryset.filter(**{self.lookup_field + "__in": lookups})
+            for obj in queryset:
+                found[get_lookup_value(obj, self.lookup_field)] = obj
+
+        objects = [found[key] for key in keys if key in found]
+        missing = [value for value, key in zip(values, keys) if key not in found]
+        return objects, missing
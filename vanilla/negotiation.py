@@ -0,0 +1,66 @@
+"""
+Content negotiation, for views that can respond with more than one format.
+"""
+
+
+def parse_accept_header(header):
+    """
+    Returns a list of `(media_range, quality)` two-tuples for an `Accept`
+    header value.
+    """
+    accepted = []
+    for item in header.split(","):
+        params = item.strip().split(";")
+        media_range = params[0].strip().lower()
+        if not media_range:
+            continue
+        quality = 1.0
+        for param in params[1:]:
+            key, _, value = param.strip().partition("=")
+            if key.strip() == "q":
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        accepted.append((media_range, quality))
+    return accepted
+
+
+def get_quality(media_type, accepted):
+    """
+    Returns the quality of the most specific media range matching the
+    media type, or `0.0` if none match.
+    """
+    main_type = media_type.split("/")[0]
+    best_specificity, best_quality = -1, 0.0
+    for media_range, quality in accepted:
+        if media_range == media_type:
+            specificity = 2
+        elif media_range == main_type + "/*":
+            specificity = 1
+        elif media_range == "*/*":
+            specificity = 0
+        else:
+            continue
+        if specificity > best_specificity:
+            best_specificity, best_quality = specificity, quality
+    return best_quality
+
+
+def select_media_type(request, media_types):
+    """
+    Returns whichever of the given media types the request's `Accept`
+    header prefers, or `None` if it accepts none of them. Ties go to the
+    earlier media type, as does a request without an `Accept` header.
+    """
+    header = request.META.get("HTTP_ACCEPT")
+    if not header:
+        return media_types[0]
+
+    accepted = parse_accept_header(header)
+    selected, selected_quality = None, 0.0
+    for media_type in media_types:
+        quality = get_quality(media_type, accepted)
+        if quality > selected_quality:
+            selected, selected_quality = media_type, quality
+    return selected
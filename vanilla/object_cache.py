@@ -0,0 +1,233 @@
+"""
+A read-through cache of looked up objects, for views with
+`object_cache_timeout` set.
+
+Objects are stored in Django's cache framework, with a small in-process
+cache in front of it. Shared entries are keyed on a generation token for the
+model and lookup value, together with the SQL of the lookup query, so that
+views with different querysets never share objects, and saving or deleting
+an instance invalidates every cached copy of it at once.
+"""
+import pickle
+import threading
+import time
+from collections import OrderedDict
+
+from django.core.cache import caches
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.shortcuts import get_object_or_404
+
+from vanilla.caching import (
+    get_generation,
+    get_generation_key,
+    get_lookup_value,
+    get_query_key,
+    make_key,
+)
+
+# How long a request that is refilling an entry holds its lock, and how long
+# other requests for the same entry wait for it before querying themselves.
+LOCK_TIMEOUT = 10
+LOCK_WAIT = 1.0
+LOCK_POLL_INTERVAL = 0.05
+
+# The `(lookup_field, cache_alias)` pairs used by object caching views,
+# keyed on model.
+_object_cache_lookups = {}
+
+
+class LocalObjectCache(object):
+    """
+    A thread safe, least recently used cache of pickled objects, with a
+    timeout per entry, that sits in front of the shared cache.
+
+    Entries are keyed on `(cache_alias, generation_key, query_key)`, so that
+    they can be purged by generation key when an instance changes.
+    """
+
+    def __init__(self, maxsize=1024):
+        self.maxsize = maxsize
+        self.entries = OrderedDict()
+        self.versions = {}
+        self.lock = threading.Lock()
+
+    def get(self, key):
+        with self.lock:
+            try:
+                expires, data = self.entries[key]
+            except KeyError:
+                return None
+            if expires <= time.monotonic():
+                del self.entries[key]
+                return None
+            self.entries.move_to_end(key)
+        return pickle.loads(data)
+
+    def get_version(self, generation_key):
+        with self.lock:
+            return self.versions.get(generation_key, 0)
+
+    def set(self, key, obj, timeout, version):
+        """
+        Stores an object, unless its generation key has been purged since
+        `version` was read, in which case the object may be stale.
+        """
+        data = pickle.dumps(obj, pickle.HIGHEST_PROTOCOL)
+        with self.lock:
+            if self.versions.get(key[1], 0) != version:
+                return
+            self.entries[key] = (time.monotonic() + timeout, data)
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.maxsize:
+                self.entries.popitem(last=False)
+
+    def purge(self, generation_key):
+        with self.lock:
+            self.versions[generation_key] = self.versions.get(generation_key, 0) + 1
+            for key in [key for key in self.entries if key[1] == generation_key]:
+                del self.entries[key]
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+            self.versions.clear()
+
+
+local_object_cache = LocalObjectCache()
+
+
+def clear_local_object_cache():
+    """
+    Discards every object in this process's local cache.
+    """
+    local_object_cache.clear()
+
+
+def register_object_cache(model, lookup_field, cache_alias):
+    """
+    Ensures cached objects for `model` are invalidated whenever an instance
+    is saved or deleted.
+    """
+    lookups = _object_cache_lookups.setdefault(model, set())
+    if not lookups:
+        dispatch_uid = "vanilla-object-cache-%s" % model._meta.label_lower
+        post_save.connect(invalidate_objects, sender=model, dispatch_uid=dispatch_uid)
+        post_delete.connect(invalidate_objects, sender=model, dispatch_uid=dispatch_uid)
+    lookups.add((lookup_field, cache_alias))
+
+
+def invalidate_objects(sender, instance, using=None, **kwargs):
+    """
+    Signal receiver that invalidates the cached copies of an instance.
+
+    Also called by the views that write without sending model signals, such
+    as direct and versioned updates, and `bulk_update()`.
+    """
+    keys = []
+    for lookup_field, cache_alias in _object_cache_lookups.get(sender, ()):
+        value = get_lookup_value(instance, lookup_field)
+        if value is not None:
+            keys.append((cache_alias, get_generation_key(sender, lookup_field, value)))
+    invalidate_keys(keys, using)
+
+
+def invalidate_lookup_values(model, lookup_field, values, using=None):
+    """
+    Invalidates the cached copies of the objects with the given values of
+    `lookup_field`, for writes that don't fetch the objects.
+    """
+    keys = []
+    for registered_field, cache_alias in _object_cache_lookups.get(model, ()):
+        if registered_field == lookup_field:
+            keys.extend(
+                (cache_alias, get_generation_key(model, lookup_field, value))
+                for value in values
+            )
+    invalidate_keys(keys, using)
+
+
+def invalidate_keys(keys, using=None):
+    """
+    Deletes the given `(cache_alias, generation_key)` pairs from the shared
+    cache, and purges them from the local cache.
+
+    The entries are invalidated again once the transaction commits, in case
+    another request cached the old row in the meantime.
+    """
+    if not keys:
+        return
+
+    def invalidate():
+        for cache_alias, key in keys:
+            caches[cache_alias].delete(key)
+            local_object_cache.purge(key)
+
+    invalidate()
+    transaction.on_commit(invalidate, using=using)
+
+
+def get_cached_object(
+    queryset, lookup, lookup_field, cache_alias, timeout, local_timeout=0
+):
+    """
+    Returns the single object matching the lookup, from the local or shared
+    cache if possible, or otherwise from the database, raising `Http404` if
+    there isn't one.
+
+    When several requests miss the shared cache for the same object at once,
+    only one of them queries the database, while the others wait briefly for
+    it to refill the entry.
+    """
+    queryset = queryset.filter(**lookup)
+    query_key = get_query_key(queryset) if lookup_field in lookup else None
+    if query_key is None:
+        return get_object_or_404(queryset)
+
+    generation_key = get_generation_key(
+        queryset.model, lookup_field, lookup[lookup_field]
+    )
+    local_key = (cache_alias, generation_key, query_key)
+    if local_timeout:
+        version = local_object_cache.get_version(generation_key)
+        obj = local_object_cache.get(local_key)
+        if obj is not None:
+            return obj
+
+    cache = caches[cache_alias]
+    generation = get_generation(cache, generation_key, timeout, create=True)
+    key = make_key("object", generation, query_key)
+    obj = cache.get(key)
+    if obj is None:
+        obj = refill(cache, key, timeout, lambda: get_object_or_404(queryset))
+
+    if local_timeout:
+        local_object_cache.set(local_key, obj, min(local_timeout, timeout), version)
+    return obj
+
+
+def refill(cache, key, timeout, fetch):
+    """
+    Fetches and caches the object for `key`, if no other request is already
+    doing so. Otherwise waits for that request to finish, and only fetches
+    the object without caching it if it takes too long.
+    """
+    lock_key = key + ":lock"
+    if cache.add(lock_key, 1, LOCK_TIMEOUT):
+        try:
+            obj = fetch()
+            cache.set(key, obj, timeout)
+            return obj
+        finally:
+            cache.delete(lock_key)
+
+    deadline = time.monotonic() + LOCK_WAIT
+    while time.monotonic() < deadline:
+        time.sleep(LOCK_POLL_INTERVAL)
+        obj = cache.get(key)
+        if obj is not None:
+            return obj
+        if lock_key not in cache:
+            # The other request failed, or found no object.
+            break
+    return fetch()
@@ -0,0 +1,254 @@
+import hashlib
+import re
+
+from django.core.cache import caches
+from django.core.exceptions import FieldDoesNotExist, ValidationError
+from django.core.paginator import (
+    EmptyPage,
+    InvalidPage,
+    Page,
+    PageNotAnInteger,
+    Paginator,
+)
+from django.db.models.query import QuerySet
+from django.utils.encoding import force_bytes, force_str
+from django.utils.functional import cached_property
+from django.utils.http import urlsafe_base64_decode, urlsafe_base64_encode
+
+
+class CursorPage(object):
+    """
+    A single page of results from a `CursorPaginator`.
+    """
+
+    def __init__(self, object_list, next_cursor, previous_cursor, paginator):
+        self.object_list = object_list
+        self.next_cursor = next_cursor
+        self.previous_cursor = previous_cursor
+        self.paginator = paginator
+
+    def __repr__(self):
+        return "<CursorPage of %d objects>" % len(self.object_list)
+
+    def __len__(self):
+        return len(self.object_list)
+
+    def __iter__(self):
+        return iter(self.object_list)
+
+    def has_next(self):
+        return self.next_cursor is not None
+
+    def has_previous(self):
+        return self.previous_cursor is not None
+
+    def has_other_pages(self):
+        return self.has_next() or self.has_previous()
+
+
+class CursorPaginator(object):
+    """
+    Keyset pagination over a unique, ordered field.
+
+    Rather than counting the queryset and using `OFFSET`, each page is
+    fetched with a `WHERE field > value` filter, using an opaque cursor
+    that encodes the boundary value. Use a '-' prefix on `ordering` for
+    descending order.
+    """
+
+    def __init__(self, queryset, page_size, ordering="pk"):
+        self.queryset = queryset
+        self.page_size = int(page_size)
+        self.ordering = ordering
+        self.field = ordering.lstrip("-")
+        self.descending = ordering.startswith("-")
+
+    def get_value(self, row):
+        """
+        Returns the boundary value of a row, which may either be a model
+        instance, or a dictionary from `values()`.
+        """
+        if isinstance(row, dict):
+            return row[self.field]
+        return getattr(row, self.field)
+
+    def encode_cursor(self, value, reverse=False):
+        """
+        Returns an opaque cursor pointing either after, or if `reverse`
+        is set before, the given boundary value.
+        """
+        direction = "-" if reverse else "+"
+        return urlsafe_base64_encode(force_bytes(direction + str(value)))
+
+    def decode_cursor(self, cursor):
+        """
+        Returns a `(value, reverse)` two-tuple for the given cursor.
+        """
+        try:
+            decoded = force_str(urlsafe_base64_decode(cursor))
+        except (TypeError, ValueError):
+            raise InvalidPage("Invalid cursor.")
+        if not decoded or decoded[0] not in "+-":
+            raise InvalidPage("Invalid cursor.")
+        return self.to_python(decoded[1:]), decoded[0] == "-"
+
+    def to_python(self, value):
+        """
+        Converts a boundary value decoded from a cursor to the Python type of
+        the ordering field, raising `InvalidPage` if it is not valid.
+        """
+        opts = self.queryset.model._meta
+        try:
+            field = opts.pk if self.field == "pk" else opts.get_field(self.field)
+        except FieldDoesNotExist:
+            # An annotation, or a path across relationships.
+            return value
+        try:
+            return field.to_python(value)
+        except ValidationError:
+            raise InvalidPage("Invalid cursor.")
+
+    def page(self, cursor=None):
+        """
+        Returns the `CursorPage` following the given cursor, or the first
+        page if no cursor is given.
+        """
+        value, reverse = (None, False) if cursor is None else self.decode_cursor(cursor)
+        descending = self.descending != reverse
+
+        queryset = self.queryset.order_by(("-" if descending else "") + self.field)
+        if value is not None:
+            lookup = "%s__%s" % (self.field, "lt" if descending else "gt")
+            try:
+                queryset = queryset.filter(**{lookup: value})
+            except (TypeError, ValueError):
+                raise InvalidPage("Invalid cursor.")
+
+        try:
+            rows = list(queryset[: self.page_size + 1])
+        except (TypeError, ValueError):
+            raise InvalidPage("Invalid cursor.")
+        has_more = len(rows) > self.page_size
+        rows = rows[: self.page_size]
+        if reverse:
+            rows.reverse()
+
+        if not rows:
+            if value is not None:
+                raise InvalidPage("That page contains no results")
+            return CursorPage(rows, None, None, self)
+
+        first = self.get_value(rows[0])
+        last = self.get_value(rows[-1])
+        has_next = has_more if not reverse else True
+        has_previous = has_more if reverse else value is not None
+        next_cursor = self.encode_cursor(last) if has_next else None
+        previous_cursor = (
+            self.encode_cursor(first, reverse=True) if has_previous else None
+        )
+        return CursorPage(rows, next_cursor, previous_cursor, self)
+
+
+class NoCountPage(Page):
+    """
+    A page from a `NoCountPaginator`, which knows if there is a following
+    page without needing the total count.
+    """
+
+    def __init__(self, object_list, number, paginator, has_next):
+        super(NoCountPage, self).__init__(object_list, number, paginator)
+        self._has_next = has_next
+
+    def __repr__(self):
+        return "<Page %s>" % self.number
+
+    def has_next(self):
+        return self._has_next
+
+    def next_page_number(self):
+        if not self._has_next:
+            raise EmptyPage("That page contains no results")
+        return self.number + 1
+
+    def start_index(self):
+        if not self.object_list:
+            return 0
+        return (self.paginator.per_page * (self.number - 1)) + 1
+
+    def end_index(self):
+        return (self.paginator.per_page * (self.number - 1)) + len(self.object_list)
+
+
+class NoCountPaginator(Paginator):
+    """
+    A paginator that never runs `COUNT(*)` to serve a page.
+
+    Each page fetches one extra row to determine if a following page exists.
+    The `count` and `num_pages` attributes are still available, but will
+    only issue a count query if they are accessed, eg. for the "last" page.
+    Orphans are not supported.
+    """
+
+    def validate_number(self, number):
+        try:
+            if isinstance(number, float) and not number.is_integer():
+                raise ValueError
+            number = int(number)
+        except (TypeError, ValueError):
+            raise PageNotAnInteger("That page number is not an integer")
+        if number < 1:
+            raise EmptyPage("That page number is less than 1")
+        return number
+
+    def page(self, number):
+        number = self.validate_number(number)
+        bottom = (number - 1) * self.per_page
+        rows = list(self.object_list[bottom : bottom + self.per_page + 1])
+        has_next = len(rows) > self.per_page
+        rows = rows[: self.per_page]
+        if not rows and (number > 1 or not self.allow_empty_first_page):
+            raise EmptyPage("That page contains no results")
+        return NoCountPage(rows, number, self, has_next)
+
+
+class CachedCountPaginator(Paginator):
+    """
+    A paginator that stores the total count in Django's cache framework for
+    `timeout` seconds, keyed by the normalized SQL of the queryset.
+    """
+
+    def __init__(
+        self, object_list, per_page, timeout=60, cache_alias="default", **kwargs
+    ):
+        super(CachedCountPaginator, self).__init__(object_list, per_page, **kwargs)
+        self.timeout = timeout
+        self.cache_alias = cache_alias
+
+    def get_count_cache_key(self):
+        """
+        Returns the cache key for the count, or `None` if the object list
+        cannot be keyed.
+        """
+        if not isinstance(self.object_list, QuerySet):
+            return None
+        try:
+            sql = str(self.object_list.query)
+        except Exception:
+            # Eg. `EmptyResultSet` for `.none()` querysets.
+            return None
+        sql = re.sub(r"\s+", " ", sql).strip()
+        digest = hashlib.md5(force_bytes(sql)).hexdigest()
+        return "vanilla:count:%s:%s" % (self.object_list.db, digest)
+
+    @cached_property
+    def count(self):
+        key = self.get_count_cache_key()
+        if key is None:
+            return Paginator.count.func(self)
+
+        cache = caches[self.cache_alias]
+        count = cache.get(key)
+        if count is None:
+            count = Paginator.count.func(self)
+            cache.set(key, count, self.timeout)
+        return count
@@ -0,0 +1,66 @@
+"""
+Rendering a single block of a template, for views with `partials` set.
+"""
+from django.core.exceptions import ImproperlyConfigured
+from django.template.backends.django import DjangoTemplates
+from django.template.context import make_context
+from django.template.loader import select_template
+from django.template.loader_tags import (
+    BLOCK_CONTEXT_KEY,
+    BlockContext,
+    BlockNode,
+    ExtendsNode,
+)
+
+
+class BlockTemplate(object):
+    """
+    A template-like object that renders a single block of a template, or of
+    the first of a list of template names that exists, including any
+    overrides of the block and `{{ block.super }}` from templates that it
+    extends.
+
+    Only templates using the Django template language are supported.
+    """
+
+    def __init__(self, template, block_name):
+        self.template = template
+        self.block_name = block_name
+
+    def render(self, context=None, request=None):
+        backend_template = self.template
+        if isinstance(backend_template, (list, tuple)):
+            backend_template = select_template(backend_template)
+        backend = getattr(backend_template, "backend", None)
+        if not isinstance(backend, DjangoTemplates):
+            msg = "Rendering the block '%s' requires the Django template backend."
+            raise ImproperlyConfigured(msg % self.block_name)
+
+        template = backend_template.template
+        context = make_context(context, request, autoescape=backend.engine.autoescape)
+        with context.render_context.push_state(template):
+            with context.bind_template(template):
+                context.template_name = template.name
+                block = self.get_block(template, context)
+                return block.render(context)
+
+    def get_block(self, template, context):
+        """
+        Collects the blocks of the template and each template that it extends,
+        in the same way as `{% extends %}`, and returns the named block.
+        """
+        template_name = template.name
+        block_context = BlockContext()
+        context.render_context[BLOCK_CONTEXT_KEY] = block_context
+        while template is not None:
+            nodelist = template.nodelist
+            blocks = nodelist.get_nodes_by_type(BlockNode)
+            block_context.add_blocks({node.name: node for node in blocks})
+            extends = nodelist.get_nodes_by_type(ExtendsNode)
+            template = extends[0].get_parent(context) if extends else None
+
+        block = block_context.get_block(self.block_name)
+        if block is None:
+            msg = "The block '%s' was not found in the template '%s'."
+            raise ImproperlyConfigured(msg % (self.block_name, template_name))
+        return block
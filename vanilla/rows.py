@@ -0,0 +1,73 @@
+"""
+Lightweight rows, for list views that set `row_fields` rather than building
+a model instance for every row.
+"""
+from collections import namedtuple
+
+from django.db.models.query import ValuesListIterable
+
+# Row classes, keyed on `(model, names)`.
+_row_class_cache = {}
+
+
+def get_row_class(model, names):
+    """
+    Returns a named tuple class with the given field names, and with
+    `get_instance()` and `get_absolute_url()` methods.
+    """
+    key = (model, names)
+    try:
+        return _row_class_cache[key]
+    except KeyError:
+        pass
+
+    opts = model._meta
+    instance_fields = {"pk"}
+    for field in opts.concrete_fields:
+        instance_fields.update((field.name, field.attname))
+    instance_names = tuple(name for name in names if name in instance_fields)
+
+    class Row(namedtuple("Row", names)):
+        __slots__ = ()
+
+        def get_instance(self):
+            """
+            Returns an unsaved model instance, with only the fetched field
+            values set.
+            """
+            values = self._asdict()
+            return model(**{name: values[name] for name in instance_names})
+
+        def get_absolute_url(self):
+            return self.get_instance().get_absolute_url()
+
+    Row.__name__ = Row.__qualname__ = "%sRow" % opts.object_name
+    _row_class_cache[key] = Row
+    return Row
+
+
+class RowIterable(ValuesListIterable):
+    """
+    Iterable for a `values_list()` queryset, that yields the row class for
+    the queryset's model.
+    """
+
+    def __iter__(self):
+        queryset = self.queryset
+        row_class = get_row_class(queryset.model, tuple(queryset._fields))
+        new = tuple.__new__
+        for row in super(RowIterable, self).__iter__():
+            yield new(row_class, row)
+
+
+def project_rows(queryset, fields):
+    """
+    Returns a queryset that yields rows with the given fields, along with
+    the primary key, rather than model instances.
+    """
+    fields = list(fields)
+    if "pk" not in fields:
+        fields.append("pk")
+    queryset = queryset.prefetch_related(None).values_list(*fields)
+    queryset._iterable_class = RowIterable
+    return queryset
@@ -0,0 +1,74 @@
+"""
+A bounded cache of compiled templates, for views with `cache_templates` set.
+
+Resolving a list of template names walks each configured loader, so views
+that cache their templates only do that once per class and list of names.
+The cache is cleared whenever the `TEMPLATES` setting changes, and when the
+development server's autoreloader detects a changed file.
+"""
+import threading
+from collections import OrderedDict
+
+from django.core.signals import setting_changed
+from django.dispatch import receiver
+from django.template.loader import select_template
+from django.utils.autoreload import file_changed
+
+
+class TemplateCache(object):
+    """
+    A thread safe, least recently used cache of compiled templates, keyed
+    on the view class and the list of template names.
+    """
+
+    def __init__(self, maxsize=256):
+        self.maxsize = maxsize
+        self.templates = OrderedDict()
+        self.lock = threading.Lock()
+
+    def get_template(self, view_class, template_names):
+        """
+        Returns the compiled template for the first of the template names
+        that exists, loading it only if it is not already cached.
+        """
+        key = (view_class, tuple(template_names))
+        with self.lock:
+            try:
+                self.templates.move_to_end(key)
+                return self.templates[key]
+            except KeyError:
+                pass
+
+        template = select_template(template_names)
+        with self.lock:
+            self.templates[key] = template
+            while len(self.templates) > self.maxsize:
+                self.templates.popitem(last=False)
+        return template
+
+    def clear(self):
+        with self.lock:
+            self.templates.clear()
+
+
+template_cache = TemplateCache()
+
+
+def clear_template_cache():
+    """
+    Discards every cached template.
+    """
+    template_cache.clear()
+
+
+@receiver(setting_changed)
+def clear_on_setting_changed(setting, **kwargs):
+    if setting == "TEMPLATES":
+        clear_template_cache()
+
+
+@receiver(file_changed)
+def clear_on_file_changed(file_path, **kwargs):
+    # Returning `None` leaves it to the autoreloader and Django's own
+    # receivers to decide whether the server should restart.
+    clear_template_cache()
@@ -1,20 +1,54 @@
-from django.core.exceptions import ImproperlyConfigured
+import asyncio
+import datetime
+import json
+import os
+import pickle
+import shutil
+import tempfile
+from pathlib import Path
+from unittest import mock, skipUnless
+
+import django
+from django.core.cache import cache
+from django.core.exceptions import ImproperlyConfigured, SuspiciousOperation
+from django.core.files.storage import FileSystemStorage
+from django.core.files.uploadedfile import SimpleUploadedFile
 from django.core.paginator import Page, Paginator
 from django.db import models
-from django.forms import BaseForm, Form, ModelForm, fields
+from django.forms import BaseForm, BaseFormSet, Form, ModelForm, fields
 from django.http import Http404
-from django.test import RequestFactory, TestCase
+from django.template.loader import select_template
+from django.test import RequestFactory, TestCase, override_settings
+from django.utils.autoreload import file_changed
+from django.utils.http import urlsafe_base64_encode
+
+try:
+    from asgiref.sync import async_to_sync
+except ImportError:  # Django < 3.0
+    async_to_sync = None
 
 from vanilla import (
+    BulkCreateView,
+    BulkDeleteView,
+    BulkUpdateView,
     CreateView,
     DeleteView,
     DetailView,
     FormView,
     ListView,
+    MultipleDetailView,
+    StreamingListView,
     TemplateView,
     UpdateView,
     View,
 )
+from vanilla.debug import NPlusOneWarning
+from vanilla.lazy import LazyValue, lazy
+from vanilla.model_views import clear_form_class_cache
+from vanilla.negotiation import select_media_type
+from vanilla.object_cache import clear_local_object_cache, refill
+from vanilla.template_cache import TemplateCache, clear_template_cache, template_cache
+from vanilla.timing import timed, view_timed
 
 
 class Example(models.Model):
@@ -24,6 +58,61 @@ class Example(models.Model):
         ordering = ("id",)
 
 
+class TimestampedExample(models.Model):
+    text = models.CharField(max_length=10)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        ordering = ("id",)
+
+    def get_absolute_url(self):
+        return "/timestamped/%d/" % self.pk
+
+
+class VersionedExample(models.Model):
+    text = models.CharField(max_length=10)
+    version = models.IntegerField(default=0)
+
+    class Meta:
+        ordering = ("id",)
+
+
+class SluggedExample(models.Model):
+    slug = models.SlugField(max_length=10, unique=True)
+    text = models.CharField(max_length=10)
+
+    class Meta:
+        ordering = ("id",)
+
+
+class TaggedExample(models.Model):
+    text = models.CharField(max_length=10)
+    tags = models.ManyToManyField(Example, blank=True)
+    version = models.IntegerField(default=0)
+
+    class Meta:
+        ordering = ("id",)
+
+
+upload_storage = FileSystemStorage(
+    location=os.path.join(tempfile.gettempdir(), "vanilla-tests")
+)
+
+
+class AttachmentExample(models.Model):
+    text = models.CharField(max_length=10)
+    attachment = models.FileField(storage=upload_storage, blank=True)
+    version = models.IntegerField(default=0)
+
+
+class RelatedExample(models.Model):
+    example = models.ForeignKey(Example, on_delete=models.CASCADE)
+    text = models.CharField(max_length=10)
+
+    class Meta:
+        ordering = ("id",)
+
+
 class ExampleForm(Form):
     text = fields.CharField(max_length=10)
 
@@ -56,6 +145,10 @@ class BaseTestCase(TestCase):
         # Hack to get around the fact that we're using request factory,
         # instead of the full test client.
         response.context = response.context_data
+        if django.VERSION >= (4, 1):
+            return super(BaseTestCase, self).assertFormError(
+                response.context[form], field, errors, msg_prefix
+            )
         return super(BaseTestCase, self).assertFormError(
             response, form, field, errors, msg_prefix
         )
@@ -137,18 +230,28 @@ class TestDetail(BaseTestCase):
     def test_detail_misconfigured_template_name(self):
         # If don't provide 'model' or 'template_name',
         # we should expect an ImproperlyConfigured exception.
-        create_instance(quantity=3)
-        pk = Example.objects.all()[0].pk
-        view = DetailView.as_view(queryset=Example.objects.all())
-        self.assertRaises(ImproperlyConfigured, self.get, view, pk=pk)
+        with self.assertRaises(ImproperlyConfigured):
+            DetailView.as_view(queryset=Example.objects.all())
 
     def test_detail_misconfigured_queryset(self):
         # If don't provide 'model' or 'queryset',
         # we should expect an ImproperlyConfigured exception.
+        with self.assertRaises(ImproperlyConfigured):
+            DetailView.as_view(template_name="example.html")
+
+    def test_detail_misconfigured_overridden_get_queryset(self):
+        # If 'get_queryset()' is overridden then the view is not
+        # misconfigured, even without 'model' or 'queryset'.
+        class CustomDetailView(DetailView):
+            template_name = "example.html"
+
+            def get_queryset(self):
+                return Example.objects.all()
+
         create_instance(quantity=3)
         pk = Example.objects.all()[0].pk
-        view = DetailView.as_view(template_name="example.html")
-        self.assertRaises(ImproperlyConfigured, self.get, view, pk=pk)
+        response = self.get(CustomDetailView.as_view(), pk=pk)
+        self.assertEqual(response.status_code, 200)
 
     def test_detail_missing_context_object_name(self):
         # If don't provide 'model' or 'context_object_name',
@@ -210,6 +313,17 @@ class TestList(BaseTestCase):
         view = ListView.as_view(model=Example, allow_empty=False)
         self.assertRaises(Http404, self.get, view, pk=999)
 
+    def test_not_empty_list_single_query(self):
+        create_instance(quantity=3)
+        view = ListView.as_view(model=Example, allow_empty=False)
+        with self.assertNumQueries(1):
+            response = self.get(view)
+            self.assertEqual(len(response.context_data["object_list"]), 3)
+
+    def test_empty_paginated_list_not_found(self):
+        view = ListView.as_view(model=Example, paginate_by=10, allow_empty=False)
+        self.assertRaises(Http404, self.get, view)
+
     def test_paginated_list(self):
         create_instance(quantity=30)
         view = ListView.as_view(model=Example, paginate_by=10)
@@ -277,6 +391,179 @@ class TestList(BaseTestCase):
         view = ListView.as_view(model=Example, paginate_by=10)
         self.assertRaises(Http404, self.get, view, page="null")
 
+    def test_paginated_list_without_count(self):
+        create_instance(quantity=30)
+        view = ListView.as_view(
+            model=Example, paginate_by=10, paginate_without_count=True
+        )
+        with self.assertNumQueries(1):
+            response = self.get(view, page=2)
+            page = response.context_data["page_obj"]
+            self.assertTrue(page.has_next())
+            self.assertTrue(response.context_data["is_paginated"])
+
+        self.assertEqual(
+            list(response.context_data["object_list"]),
+            list(Example.objects.all()[10:20]),
+        )
+        self.assertEqual(page.start_index(), 11)
+        self.assertEqual(page.end_index(), 20)
+
+        response = self.get(view, page=3)
+        self.assertFalse(response.context_data["page_obj"].has_next())
+        self.assertRaises(Http404, self.get, view, page=4)
+
+    def test_paginated_list_without_count_last_page(self):
+        create_instance(quantity=25)
+        view = ListView.as_view(
+            model=Example, paginate_by=10, paginate_without_count=True
+        )
+        response = self.get(view, page="last")
+        self.assertEqual(
+            list(response.context_data["object_list"]),
+            list(Example.objects.all()[20:]),
+        )
+
+    def test_paginated_list_cached_count(self):
+        create_instance(quantity=30)
+        view = ListView.as_view(model=Example, paginate_by=10, count_cache_timeout=60)
+        cache.clear()
+        with self.assertNumQueries(1):
+            self.get(view, page=2)
+        with self.assertNumQueries(0):
+            response = self.get(view, page=2)
+        self.assertEqual(response.context_data["paginator"].num_pages, 3)
+
+    def test_cursor_paginated_list(self):
+        create_instance(quantity=30)
+        view = ListView.as_view(model=Example, paginate_by=10, cursor_field="pk")
+        response = self.get(view)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertContext(
+            response,
+            {
+                "object_list": Example.objects.all()[:10],
+                "example_list": Example.objects.all()[:10],
+                "view": InstanceOf(View),
+                "next_cursor": InstanceOf(str),
+                "previous_cursor": None,
+                "is_paginated": True,
+            },
+        )
+
+        response = self.get(view, cursor=response.context_data["next_cursor"])
+        self.assertEqual(
+            list(response.context_data["object_list"]),
+            list(Example.objects.all()[10:20]),
+        )
+        self.assertIsNotNone(response.context_data["next_cursor"])
+
+        response = self.get(view, cursor=response.context_data["previous_cursor"])
+        self.assertEqual(
+            list(response.context_data["object_list"]),
+            list(Example.objects.all()[:10]),
+        )
+        self.assertIsNone(response.context_data["previous_cursor"])
+
+    def test_cursor_paginated_list_last_page(self):
+        create_instance(quantity=15)
+        view = ListView.as_view(model=Example, paginate_by=10, cursor_field="-pk")
+        response = self.get(view)
+        response = self.get(view, cursor=response.context_data["next_cursor"])
+
+        self.assertEqual(
+            list(response.context_data["object_list"]),
+            list(Example.objects.order_by("-pk")[10:]),
+        )
+        self.assertIsNone(response.context_data["next_cursor"])
+        self.assertIsNotNone(response.context_data["previous_cursor"])
+
+    def test_cursor_paginated_list_invalid_cursor(self):
+        create_instance(quantity=30)
+        view = ListView.as_view(model=Example, paginate_by=10, cursor_field="pk")
+        self.assertRaises(Http404, self.get, view, cursor="null")
+
+    def test_cursor_paginated_list_datetime_field(self):
+        for day in (1, 2, 3):
+            instance = TimestampedExample.objects.create(text=str(day))
+            TimestampedExample.objects.filter(pk=instance.pk).update(
+                updated_at=datetime.datetime(2020, 1, day)
+            )
+        view = ListView.as_view(
+            model=TimestampedExample, paginate_by=2, cursor_field="updated_at"
+        )
+        response = self.get(view)
+        response = self.get(view, cursor=response.context_data["next_cursor"])
+        self.assertEqual(
+            [obj.text for obj in response.context_data["object_list"]], ["3"]
+        )
+
+        cursor = urlsafe_base64_encode(b"+not a date")
+        self.assertRaises(Http404, self.get, view, cursor=cursor)
+
+
+LOCMEM_TEMPLATES = [
+    {
+        "BACKEND": "django.template.backends.django.DjangoTemplates",
+        "OPTIONS": {
+            "loaders": [
+                (
+                    "django.template.loaders.locmem.Loader",
+                    {
+                        "vanilla/example_list_header.html": "<ul>",
+                        "vanilla/example_list_row.html": "<li>{{ example.text }}</li>",
+                        "vanilla/example_list_footer.html": "</ul>",
+                        "vanilla/example_detail.html": "{{ example.text }}",
+                        "vanilla/relatedexample_list.html": (
+                            "{% for obj in object_list %}"
+                            "{{ obj.example.text }}"
+                            "{% endfor %}"
+                        ),
+                        "base.html": (
+                            "<html>{% block content %}"
+                            "{% block rows %}base{% endblock %}"
+                            "{% endblock %}</html>"
+                        ),
+                        "vanilla/example_list.html": (
+                            "{% extends 'base.html' %}"
+                            "{% block rows %}{{ block.super }}:"
+                            "{% for obj in object_list %}{{ obj.text }};{% endfor %}"
+                            "{% endblock %}"
+                        ),
+                        "example_rows.html": "{{ object_list|length }} rows",
+                        "example_form.html": "{% csrf_token %}{{ example.text }}",
+                        "example_stats.html": (
+                            "{% if show %}{{ stats.total }}/{{ stats.total }}"
+                            "{% endif %}"
+                        ),
+                    },
+                )
+            ]
+        },
+    }
+]
+
+
+@override_settings(TEMPLATES=LOCMEM_TEMPLATES)
+class TestStreamingList(BaseTestCase):
+    def test_streaming_list(self):
+        for text in ("a", "b", "c"):
+            create_instance(text=text)
+        view = StreamingListView.as_view(model=Example, chunk_size=2)
+        response = self.get(view)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.streaming)
+        self.assertEqual(
+            b"".join(response.streaming_content),
+            b"<ul><li>a</li><li>b</li><li>c</li></ul>",
+        )
+
+    def test_streaming_empty_list_not_found(self):
+        view = StreamingListView.as_view(model=Example, allow_empty=False)
+        self.assertRaises(Http404, self.get, view)
+
 
 class TestCreate(BaseTestCase):
     def test_create(self):
@@ -334,19 +621,28 @@ class TestCreate(BaseTestCase):
     def test_create_misconfigured_form_class(self):
         # If don't provide 'model' or 'form_class',
         # we should expect an ImproperlyConfigured exception.
-        view = CreateView.as_view(
-            queryset=Example.objects.all(),
-            template_name="example.html",
-            success_url="/success/",
-        )
         with self.assertRaises(ImproperlyConfigured):
-            self.post(view, data={"text": "example"})
+            CreateView.as_view(
+                queryset=Example.objects.all(),
+                template_name="example.html",
+                success_url="/success/",
+            )
+
+    def test_create_form_class_is_cached(self):
+        view = CreateView(model=Example, fields=("text",))
+        form_class = view.get_form_class()
+        self.assertIs(view.get_form_class(), form_class)
+        self.assertIs(
+            CreateView.warm_form_class(model=Example, fields=["text"]), form_class
+        )
+
+        clear_form_class_cache()
+        self.assertIsNot(view.get_form_class(), form_class)
 
     def test_create_create_no_fields(self):
         # If we don't provide `.fields` then expect a `PendingDeprecation` warning.
-        view = CreateView.as_view(model=Example, success_url="/success/")
         with self.assertRaises(ImproperlyConfigured):
-            self.post(view, data={"text": "example"})
+            CreateView.as_view(model=Example, success_url="/success/")
 
 
 class TestUpdate(BaseTestCase):
@@ -419,6 +715,109 @@ class TestUpdate(BaseTestCase):
         )
         self.assertEqual(Example.objects.count(), 3)
 
+    def test_direct_update(self):
+        for text in ("one", "two"):
+            create_instance(text=text)
+        pk = Example.objects.all()[0].pk
+        view = UpdateView.as_view(
+            model=Example,
+            fields=("text",),
+            success_url="/success/",
+            direct_update=True,
+        )
+        with self.assertNumQueries(1):
+            response = self.post(view, pk=pk, data={"text": "example"})
+
+        self.assertEqual(response.status_code, 302)
+        self.assertEqual(response["location"], "/success/")
+        self.assertEqual(
+            list(Example.objects.values_list("text", flat=True)), ["example", "two"]
+        )
+
+    def test_direct_update_unique_field(self):
+        instance = SluggedExample.objects.create(slug="one", text="one")
+        SluggedExample.objects.create(slug="two", text="two")
+        view = UpdateView.as_view(
+            model=SluggedExample,
+            fields=("slug", "text"),
+            success_url="/success/",
+            direct_update=True,
+        )
+        data = {"slug": "one", "text": "changed"}
+        response = self.post(view, pk=instance.pk, data=data)
+        self.assertEqual(response.status_code, 302)
+        self.assertEqual(SluggedExample.objects.get(slug="one").text, "changed")
+
+        # Looked up by the unique field itself.
+        view = UpdateView.as_view(
+            model=SluggedExample,
+            fields=("slug", "text"),
+            success_url="/success/",
+            direct_update=True,
+            lookup_field="slug",
+        )
+        data = {"slug": "one", "text": "again"}
+        response = self.post(view, slug="one", data=data)
+        self.assertEqual(response.status_code, 302)
+        self.assertEqual(SluggedExample.objects.get(slug="one").text, "again")
+
+        # Taking another object's value is still rejected.
+        data = {"slug": "two", "text": "again"}
+        response = self.post(view, slug="one", data=data)
+        self.assertEqual(response.status_code, 200)
+        self.assertIn("slug", response.context_data["form"].errors)
+
+    def test_direct_update_rejects_unsaveable_fields(self):
+        for model, field_names in (
+            (TaggedExample, ("text", "tags")),
+            (AttachmentExample, ("text", "attachment")),
+        ):
+            with self.assertRaises(ImproperlyConfigured):
+                UpdateView.as_view(
+                    model=model,
+                    fields=field_names,
+                    success_url="/success/",
+                    direct_update=True,
+                )
+
+    def test_direct_update_auto_now(self):
+        instance = TimestampedExample.objects.create(text="one")
+        view = UpdateView.as_view(
+            model=TimestampedExample,
+            fields=("text",),
+            success_url="/success/",
+            direct_update=True,
+        )
+        self.post(view, pk=instance.pk, data={"text": "example"})
+
+        updated = TimestampedExample.objects.get()
+        self.assertEqual(updated.text, "example")
+        self.assertGreater(updated.updated_at, instance.updated_at)
+
+    def test_direct_update_failed(self):
+        create_instance(text="one")
+        pk = Example.objects.get().pk
+        view = UpdateView.as_view(
+            model=Example,
+            fields=("text",),
+            success_url="/success/",
+            direct_update=True,
+        )
+        response = self.post(view, pk=pk, data={"text": "example" * 100})
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.context_data["object"], Example.objects.get())
+        self.assertEqual(Example.objects.get().text, "one")
+
+    def test_direct_update_not_found(self):
+        view = UpdateView.as_view(
+            model=Example,
+            fields=("text",),
+            success_url="/success/",
+            direct_update=True,
+        )
+        self.assertRaises(Http404, self.post, view, pk=999, data={"text": "example"})
+
     def test_update_no_success_url(self):
         create_instance(quantity=3)
         pk = Example.objects.all()[0].pk
@@ -428,11 +827,135 @@ class TestUpdate(BaseTestCase):
 
     def test_update_no_fields(self):
         # If we don't provide `.fields` then expect a `PendingDeprecation` warning.
-        create_instance(quantity=3)
-        pk = Example.objects.all()[0].pk
-        view = UpdateView.as_view(model=Example, success_url="/success/")
         with self.assertRaises(ImproperlyConfigured):
-            self.post(view, pk=pk, data={"text": "example"})
+            UpdateView.as_view(model=Example, success_url="/success/")
+
+
+class TestOptimisticUpdate(BaseTestCase):
+    def get_view(self, model=VersionedExample, version_field="version", **kwargs):
+        return UpdateView.as_view(
+            model=model,
+            fields=("text",),
+            success_url="/success/",
+            version_field=version_field,
+            **kwargs,
+        )
+
+    def test_invalid_version_field(self):
+        with self.assertRaises(ImproperlyConfigured):
+            self.get_view(version_field="text")
+        with self.assertRaises(ImproperlyConfigured):
+            self.get_view(version_field="missing")
+        self.get_view(model=TimestampedExample, version_field="updated_at")
+
+    def test_versioned_update_many_to_many(self):
+        create_instance(text="tag")
+        tag = Example.objects.get()
+        instance = TaggedExample.objects.create(text="one")
+        view = UpdateView.as_view(
+            model=TaggedExample,
+            fields=("text", "tags"),
+            success_url="/success/",
+            version_field="version",
+        )
+        data = {"text": "one", "tags": [tag.pk], "_version": "0"}
+        response = self.post(view, pk=instance.pk, data=data)
+
+        self.assertEqual(response.status_code, 302)
+        self.assertEqual(list(instance.tags.all()), [tag])
+
+    def test_versioned_update_file(self):
+        self.addCleanup(shutil.rmtree, upload_storage.location, ignore_errors=True)
+        instance = AttachmentExample.objects.create(text="one")
+        view = UpdateView.as_view(
+            model=AttachmentExample,
+            fields=("text", "attachment"),
+            success_url="/success/",
+            version_field="version",
+        )
+        upload = SimpleUploadedFile("notes.txt", b"contents")
+        data = {"text": "one", "attachment": upload, "_version": "0"}
+        request = self.factory.post("/", data=data)
+        response = view(request, pk=instance.pk)
+
+        self.assertEqual(response.status_code, 302)
+        attachment = AttachmentExample.objects.get().attachment
+        self.assertTrue(attachment.name.startswith("notes"))
+        with attachment.open("rb") as stored:
+            self.assertEqual(stored.read(), b"contents")
+
+    def test_version_in_form(self):
+        instance = VersionedExample.objects.create(text="one", version=3)
+        response = self.get(self.get_view(), pk=instance.pk)
+
+        self.assertEqual(response.context_data["form"]["_version"].value(), "3")
+
+    def test_update(self):
+        instance = VersionedExample.objects.create(text="one")
+        view = self.get_view()
+        response = self.post(
+            view, pk=instance.pk, data={"text": "example", "_version": "0"}
+        )
+
+        self.assertEqual(response.status_code, 302)
+        instance.refresh_from_db()
+        self.assertEqual((instance.text, instance.version), ("example", 1))
+
+    def test_conflict(self):
+        instance = VersionedExample.objects.create(text="one")
+        VersionedExample.objects.filter(pk=instance.pk).update(text="two", version=1)
+        view = self.get_view()
+        response = self.post(
+            view, pk=instance.pk, data={"text": "example", "_version": "0"}
+        )
+
+        self.assertEqual(response.status_code, 200)
+        form = response.context_data["form"]
+        self.assertIn("changed by someone else", form.non_field_errors()[0])
+        self.assertEqual(form["_version"].value(), "1")
+        self.assertEqual(form["text"].value(), "example")
+        self.assertEqual(response.context_data["object"].text, "two")
+        instance.refresh_from_db()
+        self.assertEqual((instance.text, instance.version), ("two", 1))
+
+    def test_missing_version(self):
+        instance = VersionedExample.objects.create(text="one")
+        response = self.post(self.get_view(), pk=instance.pk, data={"text": "example"})
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(VersionedExample.objects.get().text, "one")
+
+    def test_timestamp_version(self):
+        instance = TimestampedExample.objects.create(text="one")
+        view = self.get_view(model=TimestampedExample, version_field="updated_at")
+        version = self.get(view, pk=instance.pk).context_data["form"]["_version"]
+        data = {"text": "example", "_version": version.value()}
+
+        response = self.post(view, pk=instance.pk, data=data)
+        self.assertEqual(response.status_code, 302)
+        self.assertEqual(TimestampedExample.objects.get().text, "example")
+
+        data["text"] = "stale"
+        response = self.post(view, pk=instance.pk, data=data)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(TimestampedExample.objects.get().text, "example")
+
+    def test_direct_update(self):
+        instance = VersionedExample.objects.create(text="one")
+        view = self.get_view(direct_update=True)
+        with self.assertNumQueries(1):
+            response = self.post(
+                view, pk=instance.pk, data={"text": "example", "_version": "0"}
+            )
+
+        self.assertEqual(response.status_code, 302)
+        instance.refresh_from_db()
+        self.assertEqual((instance.text, instance.version), ("example", 1))
+
+    def test_not_found(self):
+        view = self.get_view(direct_update=True)
+        data = {"text": "example", "_version": "0"}
+        self.assertRaises(Http404, self.post, view, pk=999, data=data)
 
 
 class TestDelete(BaseTestCase):
@@ -473,6 +996,25 @@ class TestDelete(BaseTestCase):
         )
         self.assertEqual(Example.objects.count(), 3)
 
+    def test_direct_delete(self):
+        create_instance(quantity=3)
+        pk = Example.objects.all()[0].pk
+        view = DeleteView.as_view(
+            model=Example, success_url="/success/", direct_delete=True
+        )
+        response = self.post(view, pk=pk)
+
+        self.assertEqual(response.status_code, 302)
+        self.assertEqual(response["location"], "/success/")
+        self.assertEqual(Example.objects.count(), 2)
+        self.assertFalse(Example.objects.filter(pk=pk).exists())
+
+    def test_direct_delete_not_found(self):
+        view = DeleteView.as_view(
+            model=Example, success_url="/success/", direct_delete=True
+        )
+        self.assertRaises(Http404, self.post, view, pk=999)
+
     def test_delete_no_success_url(self):
         create_instance(quantity=3)
         pk = Example.objects.all()[0].pk
@@ -480,44 +1022,816 @@ class TestDelete(BaseTestCase):
         self.assertRaises(ImproperlyConfigured, self.post, view, pk=pk)
 
 
-class TestAttributeOverrides(BaseTestCase):
-    def test_template_name_override(self):
-        create_instance(quantity=3)
-        pk = Example.objects.all()[0].pk
-        view = DetailView.as_view(model=Example, template_name="example.html")
-        response = self.get(view, pk=pk)
+def formset_data(rows, initial=0):
+    data = {"form-TOTAL_FORMS": len(rows), "form-INITIAL_FORMS": initial}
+    for idx, row in enumerate(rows):
+        for key, value in row.items():
+            data["form-%d-%s" % (idx, key)] = value
+    return data
 
-        self.assertEqual(response.status_code, 200)
-        self.assertEqual(response.template_name, ["example.html"])
-        self.assertContext(
-            response,
-            {
-                "object": Example.objects.get(pk=pk),
-                "example": Example.objects.get(pk=pk),
-                "view": InstanceOf(View),
-            },
+
+class TestBulkCreate(BaseTestCase):
+    def test_bulk_create(self):
+        view = BulkCreateView.as_view(
+            model=Example, fields=("text",), success_url="/success/"
         )
+        data = formset_data([{"text": "one"}, {"text": "two"}, {"text": "three"}])
+        # A single INSERT, wrapped in a savepoint.
+        with self.assertNumQueries(3):
+            response = self.post(view, data=data)
 
-    def test_template_name_suffix_override(self):
-        create_instance(quantity=3)
-        pk = Example.objects.all()[0].pk
-        view = DetailView.as_view(model=Example, template_name_suffix="_suffix")
-        response = self.get(view, pk=pk)
+        self.assertEqual(response.status_code, 302)
+        self.assertEqual(response["location"], "/success/")
+        self.assertEqual(
+            list(Example.objects.values_list("text", flat=True)),
+            ["one", "two", "three"],
+        )
+
+    def test_bulk_create_failed(self):
+        view = BulkCreateView.as_view(
+            model=Example, fields=("text",), success_url="/success/"
+        )
+        data = formset_data([{"text": "one"}, {"text": "example" * 100}])
+        response = self.post(view, data=data)
 
         self.assertEqual(response.status_code, 200)
-        self.assertEqual(response.template_name, ["vanilla/example_suffix.html"])
+        self.assertEqual(response.template_name, ["vanilla/example_bulk_form.html"])
         self.assertContext(
             response,
             {
-                "object": Example.objects.get(pk=pk),
-                "example": Example.objects.get(pk=pk),
+                "formset": InstanceOf(BaseFormSet),
+                "row_errors": [
+                    (
+                        1,
+                        {
+                            "text": [
+                                "Ensure this value has at most 10 characters "
+                                "(it has 700)."
+                            ]
+                        },
+                    )
+                ],
                 "view": InstanceOf(View),
             },
         )
+        self.assertEqual(Example.objects.count(), 0)
 
-    def test_context_object_name_override(self):
-        create_instance(quantity=3)
-        pk = Example.objects.all()[0].pk
+    def test_bulk_create_preview(self):
+        view = BulkCreateView.as_view(
+            model=Example, fields=("text",), success_url="/success/"
+        )
+        response = self.get(view)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.context_data["formset"].forms), 1)
+
+    def test_bulk_create_no_success_url(self):
+        view = BulkCreateView.as_view(model=Example, fields=("text",))
+        data = formset_data([{"text": "one"}])
+        self.assertRaises(ImproperlyConfigured, self.post, view, data=data)
+
+    def test_bulk_create_many_to_many(self):
+        create_instance(text="tag")
+        tag = Example.objects.get()
+        view = BulkCreateView.as_view(
+            model=TaggedExample, fields=("text", "tags"), success_url="/success/"
+        )
+        data = formset_data(
+            [{"text": "one", "tags": [tag.pk]}, {"text": "two", "tags": []}]
+        )
+        response = self.post(view, data=data)
+
+        self.assertEqual(response.status_code, 302)
+        self.assertEqual(
+            [list(obj.tags.all()) for obj in TaggedExample.objects.all()], [[tag], []]
+        )
+
+
+class TestBulkUpdate(BaseTestCase):
+    def test_bulk_update(self):
+        for text in ("one", "two", "three"):
+            create_instance(text=text)
+        pks = list(Example.objects.values_list("pk", flat=True))
+        view = BulkUpdateView.as_view(
+            model=Example, fields=("text",), success_url="/success/"
+        )
+        data = formset_data(
+            [
+                {"id": pks[0], "text": "one"},
+                {"id": pks[1], "text": "changed"},
+                {"id": pks[2], "text": "changed"},
+            ],
+            initial=3,
+        )
+        response = self.post(view, data=data)
+
+        self.assertEqual(response.status_code, 302)
+        self.assertEqual(response["location"], "/success/")
+        self.assertEqual(
+            list(Example.objects.values_list("text", flat=True)),
+            ["one", "changed", "changed"],
+        )
+
+    def test_bulk_update_many_to_many(self):
+        create_instance(text="tag")
+        tag = Example.objects.get()
+        instance = TaggedExample.objects.create(text="one")
+        view = BulkUpdateView.as_view(
+            model=TaggedExample, fields=("text", "tags"), success_url="/success/"
+        )
+        data = formset_data(
+            [{"id": instance.pk, "text": "one", "tags": [tag.pk]}], initial=1
+        )
+        response = self.post(view, data=data)
+
+        self.assertEqual(response.status_code, 302)
+        self.assertEqual(list(instance.tags.all()), [tag])
+
+    def test_bulk_update_preview(self):
+        create_instance(text="one")
+        create_instance(text="two")
+        view = BulkUpdateView.as_view(
+            model=Example, fields=("text",), success_url="/success/"
+        )
+        response = self.get(view)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.context_data["formset"].forms), 2)
+
+
+class TestBulkDelete(BaseTestCase):
+    def test_bulk_delete(self):
+        for text in ("one", "two", "three"):
+            create_instance(text=text)
+        pks = list(Example.objects.values_list("pk", flat=True))
+        RelatedExample.objects.create(example_id=pks[0], text="related")
+        view = BulkDeleteView.as_view(model=Example, success_url="/success/")
+        response = self.post(view, data={"pk": pks[:2]})
+
+        self.assertEqual(response.status_code, 302)
+        self.assertEqual(response["location"], "/success/")
+        self.assertEqual(list(Example.objects.values_list("pk", flat=True)), pks[2:])
+        self.assertEqual(RelatedExample.objects.count(), 0)
+
+    def test_bulk_delete_invalid_values(self):
+        create_instance(text="one")
+        pk = Example.objects.get().pk
+        view = BulkDeleteView.as_view(model=Example)
+        response = self.post(view, data={"pk": ["abc", ""]})
+        self.assertEqual(response.context_data["deleted_count"], 0)
+
+        response = self.post(view, data={"pk": ["abc", str(pk)]})
+        self.assertEqual(response.context_data["deleted_count"], 1)
+        self.assertFalse(Example.objects.exists())
+
+    def test_bulk_delete_counts(self):
+        for text in ("one", "two"):
+            create_instance(text=text)
+        pks = list(Example.objects.values_list("pk", flat=True))
+        RelatedExample.objects.create(example_id=pks[0], text="related")
+        view = BulkDeleteView.as_view(model=Example)
+        response = self.post(view, data={"pk": pks})
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.context_data["deleted_count"], 3)
+        self.assertEqual(
+            response.context_data["deleted_counts"],
+            {"vanilla.Example": 2, "vanilla.RelatedExample": 1},
+        )
+
+    def test_bulk_delete_fast(self):
+        for text in ("one", "two", "three"):
+            TimestampedExample.objects.create(text=text)
+        pks = list(TimestampedExample.objects.values_list("pk", flat=True))
+        view = BulkDeleteView.as_view(model=TimestampedExample, fast_delete=True)
+        with self.assertNumQueries(1):
+            response = self.post(view, data={"pk": pks[:2]})
+
+        self.assertEqual(response.context_data["deleted_count"], 2)
+        self.assertEqual(
+            response.context_data["deleted_counts"], {"vanilla.TimestampedExample": 2}
+        )
+        self.assertEqual(TimestampedExample.objects.count(), 1)
+
+    def test_bulk_delete_fast_with_cascades(self):
+        create_instance(text="one")
+        example = Example.objects.get()
+        RelatedExample.objects.create(example=example, text="related")
+        view = BulkDeleteView.as_view(model=Example, fast_delete=True)
+        response = self.post(view, data={"pk": [example.pk]})
+
+        self.assertEqual(response.context_data["deleted_count"], 2)
+        self.assertEqual(RelatedExample.objects.count(), 0)
+
+    def test_bulk_delete_preview(self):
+        for text in ("one", "two", "three"):
+            create_instance(text=text)
+        pks = list(Example.objects.values_list("pk", flat=True))
+        view = BulkDeleteView.as_view(model=Example, success_url="/success/")
+        request = self.factory.get("/", data={"pk": pks[:2]})
+        response = view(request)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            response.template_name, ["vanilla/example_confirm_bulk_delete.html"]
+        )
+        self.assertContext(
+            response,
+            {
+                "object_list": Example.objects.filter(pk__in=pks[:2]),
+                "example_list": Example.objects.filter(pk__in=pks[:2]),
+                "view": InstanceOf(View),
+            },
+        )
+        self.assertEqual(Example.objects.count(), 3)
+
+    def test_bulk_delete_no_values(self):
+        create_instance(quantity=3)
+        view = BulkDeleteView.as_view(model=Example)
+        response = self.post(view)
+
+        self.assertEqual(response.context_data["deleted_count"], 0)
+        self.assertEqual(Example.objects.count(), 3)
+
+
+class TestMultipleDetail(BaseTestCase):
+    def setUp(self):
+        super(TestMultipleDetail, self).setUp()
+        for text in ("one", "two", "three"):
+            create_instance(text=text)
+        self.pks = list(Example.objects.values_list("pk", flat=True))
+
+    def test_multiple_detail(self):
+        view = MultipleDetailView.as_view(model=Example)
+        pks = "%d,%d" % (self.pks[2], self.pks[0])
+        with self.assertNumQueries(1):
+            response = self.get(view, pk=pks)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            response.template_name, ["vanilla/example_multiple_detail.html"]
+        )
+        expected = [Example.objects.get(pk=pk) for pk in (self.pks[2], self.pks[0])]
+        self.assertContext(
+            response,
+            {
+                "object_list": expected,
+                "example_list": expected,
+                "missing_values": [],
+                "view": InstanceOf(View),
+            },
+        )
+
+    def test_query_parameter(self):
+        view = MultipleDetailView.as_view(model=Example, lookup_field="text")
+        request = self.factory.get("/", {"text": ["two", "one", "two"]})
+        response = view(request)
+
+        texts = [obj.text for obj in response.context_data["object_list"]]
+        self.assertEqual(texts, ["two", "one"])
+
+    def test_missing(self):
+        view = MultipleDetailView.as_view(model=Example)
+        self.assertRaises(Http404, self.get, view, pk="%d,999" % self.pks[0])
+
+    def test_allow_missing(self):
+        view = MultipleDetailView.as_view(model=Example, allow_missing=True)
+        response = self.get(view, pk="999,%d,abc" % self.pks[1])
+
+        self.assertEqual(
+            response.context_data["object_list"], [Example.objects.get(pk=self.pks[1])]
+        )
+        self.assertEqual(response.context_data["missing_values"], ["999", "abc"])
+
+    def test_max_objects(self):
+        view = MultipleDetailView.as_view(model=Example, max_objects=2)
+        pks = ",".join(str(pk) for pk in self.pks)
+        self.assertRaises(SuspiciousOperation, self.get, view, pk=pks)
+
+    def test_related_lookup(self):
+        example = Example.objects.get(pk=self.pks[0])
+        RelatedExample.objects.create(example=example, text="related")
+        view = MultipleDetailView.as_view(
+            model=RelatedExample, lookup_field="example__text"
+        )
+        response = self.get(view, example__text="one")
+
+        self.assertEqual(len(response.context_data["object_list"]), 1)
+
+
+@skipUnless(django.VERSION >= (4, 1), "Async ORM requires Django 4.1+")
+class TestAsyncViews(BaseTestCase):
+    def get(self, view, *args, **kwargs):
+        request = self.factory.get("/")
+        return async_to_sync(view)(request, *args, **kwargs)
+
+    def post(self, view, *args, **kwargs):
+        data = kwargs.pop("data", {})
+        request = self.factory.post("/", data=data)
+        return async_to_sync(view)(request, *args, **kwargs)
+
+    def test_async_detail(self):
+        from vanilla.async_views import AsyncDetailView
+
+        create_instance(quantity=3)
+        pk = Example.objects.all()[0].pk
+        view = AsyncDetailView.as_view(model=Example)
+        response = self.get(view, pk=pk)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.template_name, ["vanilla/example_detail.html"])
+        self.assertEqual(response.context_data["example"], Example.objects.get(pk=pk))
+        self.assertRaises(Http404, self.get, view, pk=999)
+
+    def test_async_list(self):
+        from vanilla.async_views import AsyncListView
+
+        create_instance(quantity=30)
+        view = AsyncListView.as_view(model=Example, paginate_by=10)
+        response = self.get(view, page="last")
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            response.context_data["object_list"], list(Example.objects.all()[20:])
+        )
+        self.assertTrue(response.context_data["is_paginated"])
+
+    def test_async_create(self):
+        from vanilla.async_views import AsyncCreateView
+
+        view = AsyncCreateView.as_view(
+            model=Example, fields=("text",), success_url="/success/"
+        )
+        response = self.post(view, data={"text": "example"})
+
+        self.assertEqual(response.status_code, 302)
+        self.assertEqual(Example.objects.get().text, "example")
+
+    def test_async_update(self):
+        from vanilla.async_views import AsyncUpdateView
+
+        create_instance(quantity=3)
+        pk = Example.objects.all()[0].pk
+        view = AsyncUpdateView.as_view(
+            model=Example, fields=("text",), success_url="/success/"
+        )
+        response = self.post(view, pk=pk, data={"text": "updated"})
+
+        self.assertEqual(response.status_code, 302)
+        self.assertEqual(Example.objects.get(pk=pk).text, "updated")
+
+    def test_async_delete(self):
+        from vanilla.async_views import AsyncDeleteView
+
+        create_instance(quantity=3)
+        pk = Example.objects.all()[0].pk
+        view = AsyncDeleteView.as_view(model=Example, success_url="/success/")
+        response = self.post(view, pk=pk)
+
+        self.assertEqual(response.status_code, 302)
+        self.assertFalse(Example.objects.filter(pk=pk).exists())
+
+    def test_async_unsupported_options(self):
+        from vanilla.async_views import (
+            AsyncDeleteView,
+            AsyncDetailView,
+            AsyncListView,
+            AsyncUpdateView,
+        )
+
+        update = {"fields": ("text",), "success_url": "/success/"}
+        for view_class, options in (
+            (AsyncUpdateView, dict(update, version_field="id")),
+            (AsyncUpdateView, dict(update, direct_update=True)),
+            (AsyncDeleteView, {"success_url": "/success/", "direct_delete": True}),
+            (AsyncListView, {"row_fields": ("text",)}),
+            (AsyncListView, {"json_fields": ("text",)}),
+            (AsyncDetailView, {"last_modified_field": "id"}),
+            (AsyncDetailView, {"response_cache_timeout": 60}),
+            (AsyncDetailView, {"object_cache_timeout": 60}),
+        ):
+            with self.subTest(view_class=view_class, options=options):
+                msg = "which is not supported by the async views"
+                with self.assertRaisesMessage(ImproperlyConfigured, msg):
+                    view_class.as_view(model=Example, **options)
+
+    def test_async_update_and_delete_purge_cached_objects(self):
+        from vanilla.async_views import AsyncDeleteView, AsyncUpdateView
+
+        cache.clear()
+        clear_local_object_cache()
+        create_instance(text="original")
+        pk = Example.objects.get().pk
+        detail = DetailView.as_view(model=Example, object_cache_timeout=60)
+        response = detail(self.factory.get("/"), pk=pk)
+        self.assertEqual(response.context_data["object"].text, "original")
+
+        view = AsyncUpdateView.as_view(
+            model=Example, fields=("text",), success_url="/success/"
+        )
+        self.post(view, pk=pk, data={"text": "updated"})
+        response = detail(self.factory.get("/"), pk=pk)
+        self.assertEqual(response.context_data["object"].text, "updated")
+
+        view = AsyncDeleteView.as_view(model=Example, success_url="/success/")
+        self.post(view, pk=pk)
+        self.assertRaises(Http404, detail, self.factory.get("/"), pk=pk)
+
+
+class TestConditionalResponses(BaseTestCase):
+    def get(self, view, *args, **kwargs):
+        headers = kwargs.pop("headers", {})
+        request = self.factory.get("/", **headers)
+        return view(request, *args, **kwargs)
+
+    def test_detail_last_modified(self):
+        instance = TimestampedExample.objects.create(text="example")
+        view = DetailView.as_view(
+            model=TimestampedExample, last_modified_field="updated_at"
+        )
+        response = self.get(view, pk=instance.pk)
+
+        self.assertEqual(response.status_code, 200)
+        last_modified = response["Last-Modified"]
+        response = self.get(
+            view, pk=instance.pk, headers={"HTTP_IF_MODIFIED_SINCE": last_modified}
+        )
+        self.assertEqual(response.status_code, 304)
+
+    def test_list_last_modified_skips_rows(self):
+        TimestampedExample.objects.create(text="example")
+        view = ListView.as_view(
+            model=TimestampedExample, last_modified_field="updated_at"
+        )
+        last_modified = self.get(view)["Last-Modified"]
+
+        with self.assertNumQueries(1):
+            response = self.get(view, headers={"HTTP_IF_MODIFIED_SINCE": last_modified})
+        self.assertEqual(response.status_code, 304)
+
+    def test_detail_etag(self):
+        class EtagView(DetailView):
+            model = Example
+
+            def get_etag(self):
+                return "%s-%s" % (self.object.pk, self.object.text)
+
+        create_instance(quantity=1)
+        pk = Example.objects.get().pk
+        view = EtagView.as_view()
+        response = self.get(view, pk=pk)
+        self.assertEqual(response["ETag"], '"%s-example 0"' % pk)
+
+        response = self.get(
+            view, pk=pk, headers={"HTTP_IF_NONE_MATCH": response["ETag"]}
+        )
+        self.assertEqual(response.status_code, 304)
+
+    def test_no_validators(self):
+        create_instance(quantity=1)
+        view = DetailView.as_view(model=Example)
+        response = self.get(view, pk=Example.objects.get().pk)
+        self.assertFalse(response.has_header("ETag"))
+        self.assertFalse(response.has_header("Last-Modified"))
+
+
+@override_settings(TEMPLATES=LOCMEM_TEMPLATES)
+class TestResponseCache(BaseTestCase):
+    def setUp(self):
+        super(TestResponseCache, self).setUp()
+        cache.clear()
+
+    def test_cached_detail(self):
+        create_instance(text="abc")
+        pk = Example.objects.get().pk
+        view = DetailView.as_view(model=Example, response_cache_timeout=60)
+        response = self.get(view, pk=pk).render()
+        self.assertEqual(response.content, b"abc")
+
+        with self.assertNumQueries(0):
+            response = self.get(view, pk=pk)
+        self.assertEqual(response.content, b"abc")
+
+        # Queryset updates don't send signals, and saving other instances
+        # doesn't affect this one.
+        Example.objects.filter(pk=pk).update(text="stale")
+        Example.objects.create(text="other")
+        self.assertEqual(self.get(view, pk=pk).content, b"abc")
+
+        # Saving the instance invalidates the cached response.
+        instance = Example.objects.get(pk=pk)
+        instance.text = "def"
+        instance.save()
+        self.assertEqual(self.get(view, pk=pk).render().content, b"def")
+
+    def test_querysets_are_not_shared(self):
+        create_instance(text="abc")
+        pk = Example.objects.get().pk
+
+        class OwnedDetail(DetailView):
+            model = Example
+            response_cache_timeout = 60
+
+            def get_queryset(self):
+                queryset = super(OwnedDetail, self).get_queryset()
+                return queryset.filter(text=self.request.GET["owner"])
+
+        view = OwnedDetail.as_view()
+        request = self.factory.get("/", {"owner": "abc"})
+        self.assertEqual(view(request, pk=pk).render().content, b"abc")
+        request = self.factory.get("/", {"owner": "other"})
+        with self.assertRaises(Http404):
+            view(request, pk=pk)
+
+    def test_change_while_rendering_not_cached(self):
+        create_instance(text="abc")
+        pk = Example.objects.get().pk
+
+        class RacingDetail(DetailView):
+            model = Example
+            response_cache_timeout = 60
+            changed = False
+
+            def get_object(self):
+                obj = super(RacingDetail, self).get_object()
+                if not RacingDetail.changed:
+                    # Another request saves the object after it was read.
+                    RacingDetail.changed = True
+                    other = Example.objects.get(pk=pk)
+                    other.text = "def"
+                    other.save()
+                return obj
+
+        view = RacingDetail.as_view()
+        self.assertEqual(self.get(view, pk=pk).render().content, b"abc")
+        self.assertEqual(self.get(view, pk=pk).render().content, b"def")
+
+    def test_direct_and_versioned_updates_purge_cached_detail(self):
+        instance = VersionedExample.objects.create(text="abc")
+        detail = DetailView.as_view(
+            model=VersionedExample,
+            template_name="vanilla/example_detail.html",
+            context_object_name="example",
+            response_cache_timeout=60,
+        )
+        self.assertEqual(self.get(detail, pk=instance.pk).render().content, b"abc")
+
+        for text, attrs in (("def", {"direct_update": True}), ("ghi", {})):
+            view = UpdateView.as_view(
+                model=VersionedExample,
+                fields=("text",),
+                success_url="/success/",
+                version_field="version",
+                **attrs,
+            )
+            version = str(VersionedExample.objects.get().version)
+            data = {"text": text, "_version": version}
+            response = self.post(view, pk=instance.pk, data=data)
+            self.assertEqual(response.status_code, 302)
+            content = self.get(detail, pk=instance.pk).render().content
+            self.assertEqual(content, text.encode())
+
+    def test_bulk_update_purges_cached_detail(self):
+        create_instance(text="abc")
+        pk = Example.objects.get().pk
+        detail = DetailView.as_view(model=Example, response_cache_timeout=60)
+        self.assertEqual(self.get(detail, pk=pk).render().content, b"abc")
+
+        view = BulkUpdateView.as_view(
+            model=Example, fields=("text",), success_url="/success/"
+        )
+        data = formset_data([{"id": pk, "text": "def"}], initial=1)
+        self.assertEqual(self.post(view, data=data).status_code, 302)
+        self.assertEqual(self.get(detail, pk=pk).render().content, b"def")
+
+    def test_user_specific_responses_not_cached(self):
+        create_instance(text="abc")
+        pk = Example.objects.get().pk
+        view = DetailView.as_view(
+            model=Example, template_name="example_form.html", response_cache_timeout=60
+        )
+        self.get(view, pk=pk).render()
+        with self.assertNumQueries(1):
+            self.get(view, pk=pk).render()
+
+        class CookieDetail(DetailView):
+            def render_to_response(self, context):
+                response = super(CookieDetail, self).render_to_response(context)
+                response.set_cookie("seen", "1")
+                return response
+
+        view = CookieDetail.as_view(model=Example, response_cache_timeout=60)
+        self.get(view, pk=pk).render()
+        with self.assertNumQueries(1):
+            self.get(view, pk=pk).render()
+
+    def test_update_purges_cached_detail(self):
+        create_instance(text="abc")
+        pk = Example.objects.get().pk
+        detail = DetailView.as_view(model=Example, response_cache_timeout=60)
+        self.get(detail, pk=pk).render()
+
+        update = UpdateView.as_view(
+            model=Example,
+            fields=("text",),
+            success_url="/success/",
+            response_cache_timeout=60,
+        )
+        self.post(update, pk=pk, data={"text": "def"})
+        self.assertEqual(self.get(detail, pk=pk).render().content, b"def")
+
+
+@override_settings(TEMPLATES=LOCMEM_TEMPLATES)
+class TestObjectCache(BaseTestCase):
+    def setUp(self):
+        super(TestObjectCache, self).setUp()
+        cache.clear()
+        clear_local_object_cache()
+        create_instance(text="abc")
+        self.pk = Example.objects.get().pk
+
+    def test_cached_detail(self):
+        view = DetailView.as_view(model=Example, object_cache_timeout=60)
+        with self.assertNumQueries(1):
+            response = self.get(view, pk=self.pk).render()
+        self.assertEqual(response.content, b"abc")
+
+        # Served from the local cache, then from the shared cache.
+        with self.assertNumQueries(0):
+            response = self.get(view, pk=self.pk).render()
+        self.assertEqual(response.content, b"abc")
+        clear_local_object_cache()
+        with self.assertNumQueries(0):
+            response = self.get(view, pk=self.pk).render()
+        self.assertEqual(response.content, b"abc")
+
+        # Saving the instance invalidates both caches.
+        instance = Example.objects.get(pk=self.pk)
+        instance.text = "def"
+        instance.save()
+        self.assertEqual(self.get(view, pk=self.pk).render().content, b"def")
+
+        instance.delete()
+        with self.assertRaises(Http404):
+            self.get(view, pk=self.pk)
+
+    def test_cached_copies_are_independent(self):
+        view = DetailView.as_view(model=Example, object_cache_timeout=60)
+        first = self.get(view, pk=self.pk).context_data["object"]
+        first.text = "changed"
+        second = self.get(view, pk=self.pk).context_data["object"]
+        self.assertEqual(second.text, "abc")
+
+    def test_querysets_are_not_shared(self):
+        view = DetailView.as_view(model=Example, object_cache_timeout=60)
+        self.get(view, pk=self.pk)
+
+        view = DetailView.as_view(
+            model=Example,
+            queryset=Example.objects.filter(text="other"),
+            object_cache_timeout=60,
+        )
+        with self.assertRaises(Http404):
+            self.get(view, pk=self.pk)
+
+    def test_post_bypasses_cache(self):
+        view = UpdateView.as_view(
+            model=Example,
+            fields=("text",),
+            success_url="/success/",
+            object_cache_timeout=60,
+        )
+        self.get(view, pk=self.pk)
+        Example.objects.filter(pk=self.pk).update(text="stale")
+        with self.assertNumQueries(0):
+            self.get(view, pk=self.pk)
+
+        response = self.post(view, pk=self.pk, data={"text": "def"})
+        self.assertEqual(response.status_code, 302)
+        self.assertEqual(Example.objects.get().text, "def")
+        response = self.get(view, pk=self.pk)
+        self.assertEqual(response.context_data["object"].text, "def")
+
+    def assertCachedText(self, model, pk, text):
+        view = DetailView.as_view(model=model, object_cache_timeout=60)
+        self.assertEqual(self.get(view, pk=pk).context_data["object"].text, text)
+
+    def test_versioned_update_invalidates(self):
+        instance = VersionedExample.objects.create(text="old")
+        self.assertCachedText(VersionedExample, instance.pk, "old")
+        view = UpdateView.as_view(
+            model=VersionedExample,
+            fields=("text",),
+            success_url="/success/",
+            version_field="version",
+        )
+        data = {"text": "new", "_version": "0"}
+        response = self.post(view, pk=instance.pk, data=data)
+        self.assertEqual(response.status_code, 302)
+        self.assertCachedText(VersionedExample, instance.pk, "new")
+
+    def test_direct_update_invalidates(self):
+        self.assertCachedText(Example, self.pk, "abc")
+        view = UpdateView.as_view(
+            model=Example,
+            fields=("text",),
+            success_url="/success/",
+            direct_update=True,
+        )
+        self.post(view, pk=self.pk, data={"text": "new"})
+        self.assertCachedText(Example, self.pk, "new")
+
+    def test_bulk_update_invalidates(self):
+        self.assertCachedText(Example, self.pk, "abc")
+        view = BulkUpdateView.as_view(
+            model=Example, fields=("text",), success_url="/success/"
+        )
+        data = formset_data([{"id": self.pk, "text": "new"}], initial=1)
+        self.post(view, data=data)
+        self.assertCachedText(Example, self.pk, "new")
+
+    def test_deletes_invalidate(self):
+        other = Example.objects.create(text="other")
+        self.assertCachedText(Example, self.pk, "abc")
+        self.assertCachedText(Example, other.pk, "other")
+
+        view = DeleteView.as_view(
+            model=Example, success_url="/success/", direct_delete=True
+        )
+        self.post(view, pk=self.pk)
+        with self.assertRaises(Http404):
+            self.assertCachedText(Example, self.pk, "abc")
+
+        view = BulkDeleteView.as_view(
+            model=Example, success_url="/success/", fast_delete=True
+        )
+        self.post(view, data={"pk": [other.pk]})
+        with self.assertRaises(Http404):
+            self.assertCachedText(Example, other.pk, "other")
+
+    def test_refill_waits_for_other_request(self):
+        cache.add("key:lock", 1)
+        fetch = mock.Mock(return_value="fetched")
+
+        def sleep(seconds):
+            cache.set("key", "cached")
+
+        with mock.patch("vanilla.object_cache.time.sleep", side_effect=sleep):
+            self.assertEqual(refill(cache, "key", 60, fetch), "cached")
+        self.assertFalse(fetch.called)
+
+    def test_refill_falls_back_to_database(self):
+        cache.add("key:lock", 1)
+        fetch = mock.Mock(return_value="fetched")
+        with mock.patch("vanilla.object_cache.LOCK_WAIT", 0.1):
+            self.assertEqual(refill(cache, "key", 60, fetch), "fetched")
+        self.assertEqual(fetch.call_count, 1)
+        self.assertIsNone(cache.get("key"))
+
+        cache.delete("key:lock")
+        self.assertEqual(refill(cache, "key", 60, fetch), "fetched")
+        self.assertEqual(cache.get("key"), "fetched")
+        self.assertIsNone(cache.get("key:lock"))
+
+
+class TestAttributeOverrides(BaseTestCase):
+    def test_template_name_override(self):
+        create_instance(quantity=3)
+        pk = Example.objects.all()[0].pk
+        view = DetailView.as_view(model=Example, template_name="example.html")
+        response = self.get(view, pk=pk)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.template_name, ["example.html"])
+        self.assertContext(
+            response,
+            {
+                "object": Example.objects.get(pk=pk),
+                "example": Example.objects.get(pk=pk),
+                "view": InstanceOf(View),
+            },
+        )
+
+    def test_template_name_suffix_override(self):
+        create_instance(quantity=3)
+        pk = Example.objects.all()[0].pk
+        view = DetailView.as_view(model=Example, template_name_suffix="_suffix")
+        response = self.get(view, pk=pk)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.template_name, ["vanilla/example_suffix.html"])
+        self.assertContext(
+            response,
+            {
+                "object": Example.objects.get(pk=pk),
+                "example": Example.objects.get(pk=pk),
+                "view": InstanceOf(View),
+            },
+        )
+
+    def test_context_object_name_override(self):
+        create_instance(quantity=3)
+        pk = Example.objects.all()[0].pk
         view = DetailView.as_view(model=Example, context_object_name="current")
         response = self.get(view, pk=pk)
 
@@ -576,6 +1890,737 @@ class TestAttributeOverrides(BaseTestCase):
         )
 
 
+@override_settings(TEMPLATES=LOCMEM_TEMPLATES)
+class TestPartials(BaseTestCase):
+    def setUp(self):
+        super(TestPartials, self).setUp()
+        for text in ("one", "two"):
+            create_instance(text=text)
+
+    def render(self, view, **headers):
+        request = self.factory.get("/", **headers)
+        response = view(request)
+        return response.render()
+
+    def test_full_page(self):
+        view = ListView.as_view(model=Example, partials=["rows"])
+        response = self.render(view)
+
+        self.assertEqual(response.content, b"<html>base:one;two;</html>")
+        self.assertEqual(response["Vary"], "X-Partial")
+
+    def test_block_by_param(self):
+        view = ListView.as_view(model=Example, partials=["rows"])
+        request = self.factory.get("/", {"partial": "rows"})
+        response = view(request).render()
+
+        self.assertEqual(response.content, b"base:one;two;")
+
+    def test_block_by_header(self):
+        view = ListView.as_view(model=Example, partials=["rows", "content"])
+        response = self.render(view, HTTP_X_PARTIAL="content")
+
+        self.assertEqual(response.content, b"base:one;two;")
+
+    def test_mapped_template(self):
+        view = ListView.as_view(model=Example, partials={"rows": "example_rows.html"})
+        response = self.render(view, HTTP_X_PARTIAL="rows")
+
+        self.assertEqual(response.content, b"2 rows")
+
+    def test_unknown_partial(self):
+        view = ListView.as_view(model=Example, partials=["rows"])
+        with self.assertRaises(Http404):
+            self.render(view, HTTP_X_PARTIAL="other")
+
+    def test_missing_block(self):
+        view = ListView.as_view(model=Example, partials=["other"])
+        with self.assertRaises(ImproperlyConfigured):
+            self.render(view, HTTP_X_PARTIAL="other")
+
+    def test_partials_disabled(self):
+        view = ListView.as_view(model=Example)
+        response = self.render(view, HTTP_X_PARTIAL="rows")
+
+        self.assertEqual(response.content, b"<html>base:one;two;</html>")
+        self.assertFalse(response.has_header("Vary"))
+
+    def test_template_view(self):
+        view = TemplateView.as_view(
+            template_name="vanilla/example_list.html", partials=["rows"]
+        )
+        response = self.render(view, HTTP_X_PARTIAL="rows")
+
+        self.assertEqual(response.content, b"base:")
+
+
+class TestJSONResponses(BaseTestCase):
+    def setUp(self):
+        super(TestJSONResponses, self).setUp()
+        for text in ("one", "two", "three"):
+            create_instance(text=text)
+        self.pks = list(Example.objects.values_list("pk", flat=True))
+
+    def get_json(self, view, accept="application/json", data=None, **kwargs):
+        request = self.factory.get("/", data=data, HTTP_ACCEPT=accept)
+        response = view(request, **kwargs)
+        if response.streaming:
+            content = b"".join(response.streaming_content)
+        else:
+            content = response.content
+        return response, json.loads(content.decode("utf-8"))
+
+    def test_list(self):
+        view = ListView.as_view(model=Example, json_fields=("id", "text"))
+        response, data = self.get_json(view)
+
+        self.assertEqual(response["Content-Type"], "application/json")
+        self.assertEqual(response["Vary"], "Accept")
+        self.assertEqual(
+            data,
+            {
+                "object_list": [
+                    {"id": self.pks[0], "text": "one"},
+                    {"id": self.pks[1], "text": "two"},
+                    {"id": self.pks[2], "text": "three"},
+                ]
+            },
+        )
+
+    def test_paginated_list(self):
+        view = ListView.as_view(model=Example, json_fields=("text",), paginate_by=2)
+        response, data = self.get_json(view, data={"page": 2})
+
+        self.assertEqual(
+            data,
+            {
+                "object_list": [{"text": "three"}],
+                "page": 2,
+                "count": 3,
+                "num_pages": 2,
+                "next_page": None,
+                "previous_page": 1,
+            },
+        )
+
+    def test_cursor_paginated_list(self):
+        view = ListView.as_view(
+            model=Example, json_fields=("text",), paginate_by=2, cursor_field="pk"
+        )
+        response, data = self.get_json(view)
+
+        self.assertEqual(
+            data["object_list"],
+            [{"text": "one", "pk": self.pks[0]}, {"text": "two", "pk": self.pks[1]}],
+        )
+        self.assertIsNone(data["previous_cursor"])
+
+        response, data = self.get_json(view, data={"cursor": data["next_cursor"]})
+        self.assertEqual(data["object_list"], [{"text": "three", "pk": self.pks[2]}])
+
+    def test_streaming_list(self):
+        view = ListView.as_view(
+            model=Example, json_fields=("text",), json_streaming=True
+        )
+        with self.assertNumQueries(1):
+            response, data = self.get_json(view)
+
+        self.assertTrue(response.streaming)
+        self.assertEqual(
+            data,
+            {"object_list": [{"text": "one"}, {"text": "two"}, {"text": "three"}]},
+        )
+
+    def test_detail(self):
+        view = DetailView.as_view(model=Example, json_fields=("id", "text"))
+        response, data = self.get_json(view, pk=self.pks[1])
+
+        self.assertEqual(response["Vary"], "Accept")
+        self.assertEqual(data, {"id": self.pks[1], "text": "two"})
+
+    def test_detail_not_found(self):
+        view = DetailView.as_view(model=Example, json_fields=("id", "text"))
+        with self.assertRaises(Http404):
+            self.get_json(view, pk=999)
+
+    def test_detail_uses_get_object(self):
+        class RestrictedDetail(DetailView):
+            model = Example
+            json_fields = ("id", "text")
+
+            def get_object(self):
+                obj = super(RestrictedDetail, self).get_object()
+                if obj.text == "two":
+                    raise Http404("Access denied.")
+                return obj
+
+        view = RestrictedDetail.as_view()
+        with self.assertRaises(Http404):
+            self.get_json(view, pk=self.pks[1])
+        with self.assertNumQueries(2):
+            response, data = self.get_json(view, pk=self.pks[0])
+        self.assertEqual(data, {"id": self.pks[0], "text": "one"})
+
+    def test_browser_gets_html(self):
+        view = DetailView.as_view(model=Example, json_fields=("id", "text"))
+        accept = "text/html,application/xhtml+xml,*/*;q=0.8"
+        request = self.factory.get("/", HTTP_ACCEPT=accept)
+        response = view(request, pk=self.pks[0])
+
+        self.assertEqual(response.template_name, ["vanilla/example_detail.html"])
+        self.assertEqual(response["Vary"], "Accept")
+
+    def test_json_disabled(self):
+        view = DetailView.as_view(model=Example)
+        request = self.factory.get("/", HTTP_ACCEPT="application/json")
+        response = view(request, pk=self.pks[0])
+
+        self.assertEqual(response.template_name, ["vanilla/example_detail.html"])
+        self.assertFalse(response.has_header("Vary"))
+
+    def test_select_media_type(self):
+        media_types = ("text/html", "application/json")
+        for accept, expected in (
+            (None, "text/html"),
+            ("*/*", "text/html"),
+            ("application/json", "application/json"),
+            ("application/*", "application/json"),
+            ("text/html;q=0.5, application/json", "application/json"),
+            ("application/json;q=0.5, */*", "text/html"),
+            ("image/png", None),
+        ):
+            headers = {} if accept is None else {"HTTP_ACCEPT": accept}
+            request = self.factory.get("/", **headers)
+            self.assertEqual(select_media_type(request, media_types), expected, accept)
+
+
+class TestRowProjection(BaseTestCase):
+    def setUp(self):
+        super(TestRowProjection, self).setUp()
+        for text in ("one", "two", "three"):
+            create_instance(text=text)
+        self.pks = list(Example.objects.values_list("pk", flat=True))
+
+    def test_rows(self):
+        view = ListView.as_view(model=Example, row_fields=("text",))
+        with self.assertNumQueries(1):
+            response = self.get(view)
+            rows = list(response.context_data["example_list"])
+
+        self.assertFalse(isinstance(rows[0], Example))
+        self.assertEqual([row.text for row in rows], ["one", "two", "three"])
+        self.assertEqual([row.pk for row in rows], self.pks)
+        self.assertIs(
+            response.context_data["object_list"],
+            response.context_data["example_list"],
+        )
+
+    def test_paginated_rows(self):
+        view = ListView.as_view(model=Example, row_fields=("text",), paginate_by=2)
+        request = self.factory.get("/", {"page": 2})
+        response = view(request)
+
+        self.assertEqual(
+            [row.text for row in response.context_data["example_list"]], ["three"]
+        )
+        self.assertEqual(response.context_data["paginator"].count, 3)
+
+    def test_cursor_paginated_rows(self):
+        view = ListView.as_view(
+            model=Example, row_fields=("text",), paginate_by=2, cursor_field="-pk"
+        )
+        response = self.get(view)
+        rows = response.context_data["example_list"]
+
+        self.assertEqual([row.text for row in rows], ["three", "two"])
+        self.assertIsNotNone(response.context_data["next_cursor"])
+
+    def test_get_absolute_url(self):
+        instance = TimestampedExample.objects.create(text="example")
+        view = ListView.as_view(model=TimestampedExample, row_fields=("text",))
+        row = list(self.get(view).context_data["object_list"])[0]
+
+        self.assertEqual(row.get_absolute_url(), "/timestamped/%d/" % instance.pk)
+        self.assertEqual(row.get_instance().text, "example")
+
+    @override_settings(TEMPLATES=LOCMEM_TEMPLATES)
+    def test_streaming_rows(self):
+        view = StreamingListView.as_view(model=Example, row_fields=("text",))
+        response = self.get(view)
+        content = b"".join(response.streaming_content)
+
+        self.assertEqual(content, b"<ul><li>one</li><li>two</li><li>three</li></ul>")
+
+    @override_settings(TEMPLATES=LOCMEM_TEMPLATES)
+    def test_streaming_rows_get_row_fields(self):
+        class TextRows(StreamingListView):
+            model = Example
+            row_fields = ("id",)
+
+            def get_row_fields(self):
+                return ["text"]
+
+        response = self.get(TextRows.as_view())
+        content = b"".join(response.streaming_content)
+
+        self.assertEqual(content, b"<ul><li>one</li><li>two</li><li>three</li></ul>")
+
+
+class TestTemplateCache(BaseTestCase):
+    def setUp(self):
+        super(TestTemplateCache, self).setUp()
+        clear_template_cache()
+        create_instance(text="one")
+
+    @override_settings(TEMPLATES=LOCMEM_TEMPLATES)
+    def test_cached_template(self):
+        view = DetailView.as_view(model=Example, cache_templates=True)
+        pk = Example.objects.get().pk
+        with mock.patch(
+            "vanilla.template_cache.select_template", wraps=select_template
+        ) as loader:
+            first = self.get(view, pk=pk).render()
+            second = self.get(view, pk=pk).render()
+
+        self.assertEqual(loader.call_count, 1)
+        self.assertIs(first.template_name, second.template_name)
+        self.assertEqual(second.content, b"one")
+
+    def test_cleared_when_templates_change(self):
+        view = TemplateView.as_view(template_name="example.html", cache_templates=True)
+        for content in ("first", "second"):
+            templates = [
+                {
+                    "BACKEND": "django.template.backends.django.DjangoTemplates",
+                    "OPTIONS": {
+                        "loaders": [
+                            (
+                                "django.template.loaders.locmem.Loader",
+                                {"example.html": content},
+                            )
+                        ]
+                    },
+                }
+            ]
+            with override_settings(TEMPLATES=templates):
+                response = self.get(view).render()
+            self.assertEqual(response.content.decode("utf-8"), content)
+
+    @override_settings(TEMPLATES=LOCMEM_TEMPLATES)
+    def test_cleared_when_file_changes(self):
+        template_cache.get_template(ListView, ["vanilla/example_detail.html"])
+        file_changed.send(sender=None, file_path=Path("templates/example.html"))
+        self.assertEqual(len(template_cache.templates), 0)
+
+    @override_settings(TEMPLATES=LOCMEM_TEMPLATES)
+    def test_bounded_size(self):
+        cache = TemplateCache(maxsize=2)
+        cache.get_template(ListView, ["vanilla/example_detail.html"])
+        cache.get_template(ListView, ["base.html"])
+        cache.get_template(ListView, ["vanilla/example_detail.html"])
+        cache.get_template(ListView, ["example_rows.html"])
+
+        self.assertEqual(
+            list(cache.templates),
+            [
+                (ListView, ("vanilla/example_detail.html",)),
+                (ListView, ("example_rows.html",)),
+            ],
+        )
+
+
+class StatsView(TemplateView):
+    template_name = "example_stats.html"
+    lazy_context = {"stats": "get_stats"}
+    calls = 0
+
+    def get_stats(self):
+        StatsView.calls += 1
+        return {"total": Example.objects.count()}
+
+    def get_context_data(self, **kwargs):
+        kwargs["show"] = self.request.GET.get("show") == "1"
+        return super(StatsView, self).get_context_data(**kwargs)
+
+
+@override_settings(TEMPLATES=LOCMEM_TEMPLATES)
+class TestLazyContext(BaseTestCase):
+    def setUp(self):
+        super(TestLazyContext, self).setUp()
+        StatsView.calls = 0
+        create_instance(quantity=2)
+
+    def test_evaluated_once(self):
+        request = self.factory.get("/", {"show": "1"})
+        with self.assertNumQueries(1):
+            response = StatsView.as_view()(request).render()
+
+        self.assertEqual(response.content, b"2/2")
+        self.assertEqual(StatsView.calls, 1)
+
+    def test_unused_not_evaluated(self):
+        request = self.factory.get("/")
+        view = StatsView.as_view()
+        with self.assertNumQueries(0):
+            with self.assertLogs("vanilla", level="DEBUG") as logs:
+                response = view(request).render()
+
+        self.assertEqual(response.content, b"")
+        self.assertEqual(StatsView.calls, 0)
+        self.assertIn("did not use the lazy context values: stats", logs.output[0])
+
+    def test_model_view_lazy_helper(self):
+        class CountingDetail(DetailView):
+            model = Example
+
+            def get_context_data(self, **kwargs):
+                kwargs["related"] = lazy(self.get_related)
+                return super(CountingDetail, self).get_context_data(**kwargs)
+
+            def get_related(self):
+                return list(RelatedExample.objects.filter(example=self.object))
+
+        view = CountingDetail.as_view()
+        pk = Example.objects.all()[0].pk
+        with self.assertNumQueries(1):
+            response = view(self.factory.get("/"), pk=pk).render()
+
+        self.assertEqual(response.content, b"example 0")
+        self.assertFalse(response.context_data["related"].evaluated)
+
+    def test_lazy_context_in_model_view(self):
+        view = DetailView.as_view(
+            model=Example, lazy_context={"count": "get_paginate_by"}
+        )
+        pk = Example.objects.all()[0].pk
+        response = self.get(view, pk=pk)
+
+        self.assertIsInstance(response.context_data["count"], LazyValue)
+
+
+class TestMemoizedLookups(BaseTestCase):
+    def setUp(self):
+        super(TestMemoizedLookups, self).setUp()
+        create_instance(text="one")
+        self.pk = Example.objects.get().pk
+
+    def get_view_class(self, **attrs):
+        class ExtraContextDetail(DetailView):
+            model = Example
+
+            def get_context_data(self, **kwargs):
+                kwargs["again"] = self.get_object()
+                kwargs["count"] = self.get_queryset().count()
+                return super(ExtraContextDetail, self).get_context_data(**kwargs)
+
+        for key, value in attrs.items():
+            setattr(ExtraContextDetail, key, value)
+        return ExtraContextDetail
+
+    def test_memoized(self):
+        view = self.get_view_class().as_view()
+        with self.assertNumQueries(2):
+            response = self.get(view, pk=self.pk)
+
+        self.assertIs(response.context_data["again"], response.context_data["object"])
+
+    def test_not_memoized(self):
+        view = self.get_view_class(memoize_lookups=False).as_view()
+        with self.assertNumQueries(3):
+            response = self.get(view, pk=self.pk)
+
+        self.assertIsNot(
+            response.context_data["again"], response.context_data["object"]
+        )
+
+    def test_invalidate_lookups(self):
+        view = DetailView(model=Example, kwargs={"pk": self.pk})
+        obj = view.get_object()
+        queryset = view.get_queryset()
+        self.assertIs(view.get_object(), obj)
+        self.assertIs(view.get_queryset(), queryset)
+
+        view.invalidate_lookups()
+        self.assertIsNot(view.get_object(), obj)
+        self.assertIsNot(view.get_queryset(), queryset)
+
+    def test_invalidated_after_save(self):
+        class CheckingUpdate(UpdateView):
+            model = Example
+            fields = ("text",)
+
+            def get_success_url(self):
+                return "/%s/" % self.get_object().text
+
+        view = CheckingUpdate.as_view()
+        response = self.post(view, pk=self.pk, data={"text": "changed"})
+
+        self.assertEqual(response["location"], "/changed/")
+
+    def test_invalidated_after_delete(self):
+        class CheckingDelete(DeleteView):
+            model = Example
+
+            def get_success_url(self):
+                return "/%d/" % self.get_queryset().count()
+
+        view = CheckingDelete.as_view()
+        response = self.post(view, pk=self.pk)
+
+        self.assertEqual(response["location"], "/0/")
+
+
+class TestQuerysetOptions(BaseTestCase):
+    def test_queryset_options(self):
+        create_instance(quantity=1)
+        example = Example.objects.get()
+        RelatedExample.objects.create(example=example, text="abc")
+        view = ListView.as_view(
+            model=RelatedExample,
+            select_related=("example",),
+            only_fields=("text", "example__text"),
+        )
+        response = self.get(view)
+
+        with self.assertNumQueries(1):
+            related = list(response.context_data["object_list"])
+            self.assertEqual(related[0].example.text, example.text)
+
+    def test_prefetch_related(self):
+        create_instance(quantity=1)
+        RelatedExample.objects.create(example=Example.objects.get(), text="abc")
+        view = ListView.as_view(
+            model=Example,
+            # Aggregating over a model with `Meta.ordering` needs an explicit
+            # ordering on Django 2.2.
+            queryset=Example.objects.order_by("id"),
+            prefetch_related=("relatedexample_set",),
+            annotations={"related_count": models.Count("relatedexample")},
+        )
+        response = self.get(view)
+
+        with self.assertNumQueries(2):
+            example = list(response.context_data["object_list"])[0]
+            self.assertEqual(example.related_count, 1)
+            self.assertEqual(example.relatedexample_set.all()[0].text, "abc")
+
+    def test_only_fields_with_pk(self):
+        create_instance(text="abc")
+        view = ListView.as_view(model=Example, only_fields=("pk", "text"))
+        response = self.get(view)
+        example = response.context_data["object_list"][0]
+        self.assertEqual(example.get_deferred_fields(), set())
+
+    def test_invalid_select_related_at_class_creation(self):
+        with self.assertRaises(ImproperlyConfigured):
+
+            class InvalidView(ListView):
+                model = RelatedExample
+                select_related = ("text",)
+
+    def test_class_creation_does_not_instantiate_view(self):
+        instances = []
+
+        class TrackedView(ListView):
+            model = RelatedExample
+            select_related = ("example",)
+
+            def __init__(self, **kwargs):
+                super(TrackedView, self).__init__(**kwargs)
+                instances.append(self)
+
+        self.assertEqual(instances, [])
+
+    def test_invalid_queryset_options_in_as_view(self):
+        with self.assertRaises(ImproperlyConfigured):
+            ListView.as_view(model=Example, only_fields=("missing",))
+        with self.assertRaises(ImproperlyConfigured):
+            ListView.as_view(model=Example, prefetch_related="relatedexample_set")
+        with self.assertRaises(ImproperlyConfigured):
+            ListView.as_view(
+                model=Example, annotations={"text": models.Count("relatedexample")}
+            )
+
+
+@override_settings(TEMPLATES=LOCMEM_TEMPLATES)
+class TestNPlusOneDetection(BaseTestCase):
+    def setUp(self):
+        super(TestNPlusOneDetection, self).setUp()
+        for text in ("a", "b", "c"):
+            example = Example.objects.create(text=text)
+            RelatedExample.objects.create(example=example, text=text)
+
+    def test_n_plus_one_detected(self):
+        view = ListView.as_view(model=RelatedExample, detect_n_plus_one=True)
+        response = self.get(view)
+        with self.assertWarns(NPlusOneWarning), self.assertLogs("vanilla") as logs:
+            response.render()
+        self.assertEqual(len(logs.records), 1)
+
+        view_instance = response.context_data["view"]
+        self.assertEqual(len(view_instance.n_plus_one_queries), 1)
+        repeated = view_instance.n_plus_one_queries[0]
+        self.assertEqual(repeated.count, 3)
+        self.assertEqual(repeated.model, Example)
+        self.assertEqual(repeated.suggestion, "select_related('example')")
+        self.assertRaises(AssertionError, view_instance.assert_no_n_plus_one)
+
+    def test_n_plus_one_not_detected(self):
+        view = ListView.as_view(
+            model=RelatedExample,
+            detect_n_plus_one=True,
+            select_related=("example",),
+        )
+        response = self.get(view).render()
+        self.assertEqual(response.content, b"abc")
+        response.context_data["view"].assert_no_n_plus_one()
+
+    def test_rendered_response_is_picklable(self):
+        view = ListView.as_view(
+            model=RelatedExample,
+            detect_n_plus_one=True,
+            select_related=("example",),
+        )
+        response = self.get(view).render()
+        restored = pickle.loads(pickle.dumps(response))
+        self.assertEqual(restored.content, b"abc")
+        self.assertFalse(hasattr(restored, "view"))
+
+
+@override_settings(TEMPLATES=LOCMEM_TEMPLATES)
+class TestTimings(BaseTestCase):
+    def test_detail_timings(self):
+        create_instance(text="abc")
+        received = []
+
+        def receiver(sender, view, timings, **kwargs):
+            received.append(timings)
+
+        view_timed.connect(receiver)
+        self.addCleanup(view_timed.disconnect, receiver)
+
+        view = DetailView.as_view(model=Example, record_timings=True)
+        with self.assertLogs("vanilla.timing", "INFO"):
+            response = self.get(view, pk=Example.objects.get().pk)
+
+        self.assertTrue(response.is_rendered)
+        self.assertEqual(response.content, b"abc")
+        phases = [item.split(";")[0] for item in response["Server-Timing"].split(", ")]
+        self.assertEqual(
+            set(phases),
+            {
+                "get_queryset",
+                "get_object",
+                "get_context_data",
+                "render_to_response",
+                "render",
+                "total",
+            },
+        )
+        self.assertEqual(len(received), 1)
+        self.assertEqual(set(received[0]), set(phases))
+
+    def test_form_timings(self):
+        view = FormView.as_view(
+            form_class=ExampleForm,
+            success_url="/success/",
+            template_name="example.html",
+            record_timings=True,
+            server_timing_header=False,
+        )
+        with self.assertLogs("vanilla.timing", "INFO") as logs:
+            response = self.post(view, data={"text": "example"})
+
+        self.assertFalse(response.has_header("Server-Timing"))
+        self.assertIn("is_valid", logs.records[0].timings)
+
+    @skipUnless(async_to_sync is not None, "Async views require Django 3.0+")
+    def test_coroutine_timed_until_finished(self):
+        async def slow():
+            await asyncio.sleep(0.01)
+            return "done"
+
+        timings = {}
+        wrapped = timed(slow, "slow", timings)
+        self.assertTrue(asyncio.iscoroutinefunction(wrapped))
+        self.assertEqual(async_to_sync(wrapped)(), "done")
+        self.assertGreaterEqual(timings["slow"], 0.01)
+
+    def test_timings_disabled(self):
+        view = TemplateView.as_view(template_name="example.html")
+        response = self.get(view)
+        self.assertFalse(response.has_header("Server-Timing"))
+
+
+class TestPrecomputedConfig(BaseTestCase):
+    def test_precomputed_config(self):
+        view = ListView.as_view(
+            model=Example, queryset=Example.objects.filter(text="abc")
+        )
+        precomputed = view.view_initkwargs["precomputed"]
+        self.assertEqual(precomputed["template_names"], ["vanilla/example_list.html"])
+        self.assertEqual(precomputed["context_object_list_name"], "example_list")
+        self.assertIn("queryset", precomputed)
+
+        create_instance(text="abc", quantity=2)
+        response = self.get(view)
+        self.assertEqual(len(response.context_data["example_list"]), 2)
+
+    def test_model_queryset_not_precomputed(self):
+        view = DetailView.as_view(model=Example)
+        self.assertNotIn("queryset", view.view_initkwargs["precomputed"])
+
+    def test_queryset_narrowed_in_dispatch(self):
+        class NarrowedList(ListView):
+            model = Example
+            queryset = Example.objects.all()
+
+            def dispatch(self, request, *args, **kwargs):
+                self.queryset = Example.objects.filter(text="a")
+                return super(NarrowedList, self).dispatch(request, *args, **kwargs)
+
+        create_instance(text="a")
+        create_instance(text="b")
+        response = self.get(NarrowedList.as_view())
+        self.assertEqual(
+            [obj.text for obj in response.context_data["object_list"]], ["a"]
+        )
+
+    def test_config_set_in_setup_or_dispatch(self):
+        class SetupTemplate(TemplateView):
+            def setup(self, request, *args, **kwargs):
+                super(SetupTemplate, self).setup(request, *args, **kwargs)
+                self.template_name = "a.html"
+
+        response = self.get(SetupTemplate.as_view())
+        self.assertEqual(response.template_name, ["a.html"])
+
+        class DispatchList(ListView):
+            template_name = "a.html"
+
+            def dispatch(self, request, *args, **kwargs):
+                self.queryset = Example.objects.filter(text="a")
+                return super(DispatchList, self).dispatch(request, *args, **kwargs)
+
+        create_instance(text="a")
+        create_instance(text="b")
+        response = self.get(DispatchList.as_view())
+        self.assertEqual(
+            [obj.text for obj in response.context_data["object_list"]], ["a"]
+        )
+
+    def test_template_name_set_per_request(self):
+        class SwitchedTemplate(TemplateView):
+            template_name = "a.html"
+
+            def get(self, request, *args, **kwargs):
+                self.template_name = "b.html"
+                return super(SwitchedTemplate, self).get(request, *args, **kwargs)
+
+        response = self.get(SwitchedTemplate.as_view())
+        self.assertEqual(response.template_name, ["b.html"])
+
+
 class TestTemplateView(BaseTestCase):
     def test_template_view(self):
         view = TemplateView.as_view(template_name="example.html")
@@ -587,8 +2632,7 @@ class TestTemplateView(BaseTestCase):
 
     def test_misconfigured_template_view(self):
         # A template view with no `template_name` is improperly configured.
-        view = TemplateView.as_view()
-        self.assertRaises(ImproperlyConfigured, self.get, view)
+        self.assertRaises(ImproperlyConfigured, TemplateView.as_view)
 
 
 class TestFormView(BaseTestCase):
@@ -639,8 +2683,8 @@ class TestFormView(BaseTestCase):
 
     def test_misconfigured_form_view_no_form_class(self):
         # A template view with no `form_class` is improperly configured.
-        view = FormView.as_view(success_url="/success/", template_name="example.html")
-        self.assertRaises(ImproperlyConfigured, self.get, view)
+        with self.assertRaises(ImproperlyConfigured):
+            FormView.as_view(success_url="/success/", template_name="example.html")
 
     def test_misconfigured_form_view_no_success_url(self):
         # A template view with no `success_url` is improperly configured.
@@ -0,0 +1,128 @@
+"""
+Per-phase timing of the view lifecycle.
+
+Enabled by setting `record_timings = True` on a view. Disabled views don't
+run any of this code.
+"""
+import asyncio
+import functools
+import logging
+import time
+
+from django.dispatch import Signal
+
+logger = logging.getLogger("vanilla.timing")
+
+# Sent once per request by views with `record_timings` set, with `view` and
+# `timings` arguments. Timings are a dictionary of phase names to seconds.
+view_timed = Signal()
+
+# The view methods that are timed, where the view defines them.
+PHASES = (
+    "get_queryset",
+    "get_object",
+    "paginate_queryset",
+    "get_form",
+    "get_context_data",
+    "render_to_response",
+)
+
+
+def timed(func, name, timings):
+    """
+    Wraps `func`, adding the time spent in each call to `timings[name]`.
+    Coroutine functions are timed until the coroutine finishes.
+    """
+
+    if asyncio.iscoroutinefunction(func):
+
+        @functools.wraps(func)
+        async def async_wrapper(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return await func(*args, **kwargs)
+            finally:
+                duration = time.perf_counter() - start
+                timings[name] = timings.get(name, 0.0) + duration
+
+        return async_wrapper
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        start = time.perf_counter()
+        try:
+            return func(*args, **kwargs)
+        finally:
+            duration = time.perf_counter() - start
+            timings[name] = timings.get(name, 0.0) + duration
+
+    return wrapper
+
+
+def dispatch_with_timings(view, dispatch, request, *args, **kwargs):
+    """
+    Calls `dispatch` with each phase method of the view instance wrapped
+    in a timer, and then passes the timings to `view.report_timings()`.
+
+    Template responses are rendered inside the view, so that rendering can
+    be timed as the 'render' phase.
+    """
+    timings = {}
+    for name in PHASES:
+        method = getattr(view, name, None)
+        if method is not None:
+            setattr(view, name, timed(method, name, timings))
+
+    get_form = getattr(view, "get_form", None)
+    if get_form is not None:
+
+        def get_timed_form(*args, **kwargs):
+            form = get_form(*args, **kwargs)
+            form.is_valid = timed(form.is_valid, "is_valid", timings)
+            return form
+
+        view.get_form = get_timed_form
+
+    start = time.perf_counter()
+    response = dispatch(request, *args, **kwargs)
+    if asyncio.iscoroutine(response):
+        return finish_async(view, response, timings, start)
+    return finish(view, response, timings, start)
+
+
+def finish(view, response, timings, start):
+    if hasattr(response, "render") and not response.is_rendered:
+        timed(response.render, "render", timings)()
+    timings["total"] = time.perf_counter() - start
+    view.report_timings(response, timings)
+    return response
+
+
+async def finish_async(view, coroutine, timings, start):
+    response = await coroutine
+    return finish(view, response, timings, start)
+
+
+def format_server_timing(timings):
+    """
+    Returns a `Server-Timing` header value for the given timings.
+    """
+    return ", ".join(
+        "%s;dur=%.3f" % (name, duration * 1000) for name, duration in timings.items()
+    )
+
+
+def emit_timings(view, response, timings, header=True):
+    """
+    Adds a `Server-Timing` header to the response if `header` is set, sends
+    the `view_timed` signal, and logs the timings.
+    """
+    if header:
+        response["Server-Timing"] = format_server_timing(timings)
+    view_timed.send(sender=view.__class__, view=view, timings=timings)
+    logger.info(
+        "%s timings: %s",
+        view.__class__.__name__,
+        format_server_timing(timings),
+        extra={"view": view.__class__.__name__, "timings": timings},
+    )
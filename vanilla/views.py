@@ -1,8 +1,21 @@
 from django.core.exceptions import ImproperlyConfigured
-from django.http import HttpResponseRedirect
+from django.http import Http404, HttpResponseRedirect
 from django.template.response import TemplateResponse
+from django.utils.cache import patch_vary_headers
+from django.utils.translation import gettext as _
 from django.views.generic import View
 
+from vanilla.config import (
+    NOT_PRECOMPUTED,
+    check_required_config,
+    get_precomputed,
+    precompute,
+)
+from vanilla.lazy import LazyValue, get_lazy_values, logger
+from vanilla.partials import BlockTemplate
+from vanilla.template_cache import template_cache
+from vanilla.timing import dispatch_with_timings, emit_timings
+
 
 class GenericView(View):
     """
@@ -12,12 +25,82 @@ class GenericView(View):
     form_class = None
     template_name = None
 
+    # Per-phase timing parameters.
+    # Set `record_timings` to time each phase of handling a request.
+    record_timings = False
+    server_timing_header = True
+
+    # Lazy context values.
+    # A dictionary mapping context names to the names of view methods, which
+    # are only called if the template uses the value.
+    lazy_context = None
+
+    # Set `cache_templates` to resolve and compile the view's templates once,
+    # rather than on every request.
+    cache_templates = False
+
+    # Partial rendering parameters.
+    # Set `partials` to a list of block names, or a dictionary mapping names
+    # to template names, to allow rendering just part of the page.
+    partials = None
+    partial_param = "partial"
+    partial_header = "X-Partial"
+
+    # Configuration that does not vary between requests is resolved once by
+    # `as_view()`, and stored in `precomputed`. The keys of `required_config`
+    # must resolve, or `as_view()` raises `ImproperlyConfigured`.
+    precomputed = None
+    required_config = ()
+
+    @classmethod
+    def as_view(cls, **initkwargs):
+        view = super(GenericView, cls).as_view(**initkwargs)
+        config, errors = precompute(
+            cls(**initkwargs),
+            {
+                "form_class": (
+                    "get_form_class",
+                    GenericView.get_form_class,
+                    {},
+                    ("form_class",),
+                ),
+                "template_names": (
+                    "get_template_names",
+                    GenericView.get_template_names,
+                    {},
+                    ("template_name",),
+                ),
+            },
+        )
+        check_required_config(cls, errors)
+        # Passed to each view instance, along with the other initkwargs.
+        view.view_initkwargs["precomputed"] = config
+        return view
+
+    def dispatch(self, request, *args, **kwargs):
+        if self.record_timings:
+            dispatch = super(GenericView, self).dispatch
+            return dispatch_with_timings(self, dispatch, request, *args, **kwargs)
+        return super(GenericView, self).dispatch(request, *args, **kwargs)
+
+    def report_timings(self, response, timings):
+        """
+        Given the response and a dictionary of phase timings in seconds, adds
+        a `Server-Timing` header, sends the `view_timed` signal, and logs
+        the timings.
+        """
+        emit_timings(self, response, timings, header=self.server_timing_header)
+
     # Form instantiation
 
     def get_form_class(self):
         """
         Returns the form class to use in this view.
         """
+        form_class = get_precomputed(self, "form_class")
+        if form_class is not NOT_PRECOMPUTED:
+            return form_class
+
         if self.form_class is not None:
             return self.form_class
 
@@ -39,6 +122,10 @@ class GenericView(View):
         Returns a set of template names that may be used when rendering
         the response.
         """
+        template_names = get_precomputed(self, "template_names")
+        if template_names is not NOT_PRECOMPUTED:
+            return list(template_names)
+
         if self.template_name is not None:
             return [self.template_name]
 
@@ -48,25 +135,94 @@ class GenericView(View):
         )
         raise ImproperlyConfigured(msg % self.__class__.__name__)
 
+    def get_template(self):
+        """
+        Returns the template to render. Either the list of template names,
+        or if `cache_templates` is set, the compiled template.
+        """
+        template_names = self.get_template_names()
+        if self.cache_templates:
+            return template_cache.get_template(type(self), template_names)
+        return template_names
+
     def get_context_data(self, **kwargs):
         """
         Takes a set of keyword arguments to use as the base context, and
         returns a context dictionary to use for the view, additionally adding
-        in 'view'.
+        in 'view', and any `lazy_context` values.
         """
         kwargs["view"] = self
+        if self.lazy_context:
+            for name, method_name in self.lazy_context.items():
+                if name not in kwargs:
+                    kwargs[name] = LazyValue(getattr(self, method_name))
         return kwargs
 
     def render_to_response(self, context):
         """
         Given a context dictionary, returns an HTTP response.
         """
-        return TemplateResponse(
-            request=self.request, template=self.get_template_names(), context=context
+        partial = self.get_partial()
+        if partial is None:
+            template = self.get_template()
+        else:
+            template = self.get_partial_template(partial)
+        response = TemplateResponse(
+            request=self.request, template=template, context=context
+        )
+        if self.partials and self.partial_header is not None:
+            patch_vary_headers(response, [self.partial_header])
+        if get_lazy_values(context):
+            response.add_post_render_callback(self.report_lazy_context)
+        return response
+
+    def report_lazy_context(self, response):
+        """
+        Post-render callback for responses with lazy context values. Sets
+        `unused_lazy_context` to the names of any lazy values the template
+        did not use, and logs them.
+        """
+        lazy_values = get_lazy_values(response.context_data)
+        self.unused_lazy_context = sorted(
+            name for name, value in lazy_values.items() if not value.evaluated
         )
+        if self.unused_lazy_context:
+            logger.debug(
+                "'%s' did not use the lazy context values: %s",
+                self.__class__.__name__,
+                ", ".join(self.unused_lazy_context),
+            )
+
+    def get_partial(self):
+        """
+        Returns the name of the partial requested by the query parameter or
+        header, or `None` if the full page was requested.
+        """
+        if not self.partials:
+            return None
+        name = self.request.GET.get(self.partial_param)
+        if not name and self.partial_header is not None:
+            name = self.request.headers.get(self.partial_header)
+        if not name:
+            return None
+        if name not in self.partials:
+            raise Http404(_("Unknown partial '%s'.") % name)
+        return name
+
+    def get_partial_template(self, name):
+        """
+        Returns the template to render for the named partial. Either the
+        mapped template name, or the block of the same name in the page
+        template.
+        """
+        if isinstance(self.partials, dict) and self.partials[name] is not None:
+            return self.partials[name]
+        return BlockTemplate(self.get_template(), name)
 
 
 class TemplateView(GenericView):
+    required_config = ("template_names",)
+
     def get(self, request, *args, **kwargs):
         context = self.get_context_data()
         return self.render_to_response(context)
@@ -74,6 +230,7 @@ class TemplateView(GenericView):
 
 class FormView(GenericView):
     success_url = None
+    required_config = ("form_class", "template_names")
 
     def get(self, request, *args, **kwargs):
         form = self.get_form()